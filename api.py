@@ -16,6 +16,9 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from graph import create_warehouse_graph
+from utils.llm_client import close_http_client
+from tools.database_tool import close_pool
+from utils.log_setup import configure_logging
 from state import GraphState
 
 app = FastAPI(
@@ -80,6 +83,9 @@ async def startup_event():
     """Initialize the LangGraph workflow on startup"""
     global warehouse_graph
     
+    # Same log setup as the CLI; uvicorn only configures its own loggers
+    configure_logging()
+    
     # Check for OpenAI API key
     import os
     if not os.getenv("OPENAI_API_KEY"):
@@ -94,6 +100,12 @@ async def startup_event():
         print(f"❌ Failed to initialize agent: {e}")
         warehouse_graph = None
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release the pooled LLM HTTP and database connections"""
+    await close_http_client()
+    await close_pool()
+
 def context_to_state(context: Optional[ConversationContext]) -> GraphState:
     """Convert API context to GraphState object"""
     if context is None:
@@ -297,8 +309,10 @@ async def chat_endpoint(request: ChatRequest) -> ChatResponse:
         result = await warehouse_graph.ainvoke(state, config=config)
         
         # Get the last assistant message
-        assistant_messages = [msg for msg in result["messages"] if msg["role"] == "assistant"]
-        response_text = assistant_messages[-1]["content"] if assistant_messages else "Hello! How can I help you find a warehouse?"
+        response_text = next(
+            (msg["content"] for msg in reversed(result["messages"]) if msg["role"] == "assistant"),
+            "Hello! How can I help you find a warehouse?",
+        )
         
         # Convert dict result directly to context (state_to_context can handle dicts now)
         response_context = state_to_context(result)
@@ -334,8 +348,10 @@ async def start_conversation() -> ChatResponse:
         result = await warehouse_graph.ainvoke(state, config=config)
         
         # Get the greeting message
-        assistant_messages = [msg for msg in result["messages"] if msg["role"] == "assistant"]
-        response_text = assistant_messages[-1]["content"] if assistant_messages else "Welcome to WareOnGo!"
+        response_text = next(
+            (msg["content"] for msg in reversed(result["messages"]) if msg["role"] == "assistant"),
+            "Welcome to WareOnGo!",
+        )
         
         # Convert dict result directly to context (state_to_context can handle dicts now)
         response_context = state_to_context(result)
@@ -1,8 +1,8 @@
 # graph.py
+import logging
 from typing import Literal
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
-from colorama import Fore, Style
 
 from state import GraphState
 from nodes import (
@@ -17,12 +17,14 @@ from nodes import (
     chit_chat_node,
 )
 
+logger = logging.getLogger(__name__)
+
 def router(state: GraphState) -> Literal["greeting", "gather_area_size", "gather_business_nature", "gather_specifics", "confirm_requirements", "search_database", "human_input", "update_state", "chit_chat", "__end__"]:
     """Router function that determines the next node based on state."""
     if state.conversation_complete:
         return "__end__"
     
-    print(f"{Fore.MAGENTA}[ROUTER]{Style.RESET_ALL} Next action: {state.next_action}")
+    logger.debug("Next action: %s", state.next_action)
     
     if state.next_action == "chit_chat":
         return "chit_chat"
@@ -0,0 +1,49 @@
+-- Indexes backing the warehouse search in tools/database_tool.py, which works without them, and the
+-- column populate.py needs. Apply before running populate.py.
+-- Safe to re-run: psql "$DATABASE_URL" -f indexes.sql
+
+-- Hash of the text each stored embedding was generated from; populate.py compares it to skip rows
+-- whose address hasn't changed.
+ALTER TABLE "WarehouseData" ADD COLUMN IF NOT EXISTS "embeddingSourceHash" TEXT;
+
+-- Every search LEFT JOINs WarehouseData on "warehouseId" and reads only the fire NOC and land type
+-- columns, so covering them lets the join be served by an index-only scan instead of heap fetches.
+CREATE INDEX IF NOT EXISTS idx_warehousedata_search
+    ON "WarehouseData" ("warehouseId")
+    INCLUDE ("fireNocAvailable", "fireSafetyMeasures", "landType");
+
+-- Approximate nearest-neighbour index for the location-embedding search (embedding <=> query, as in
+-- test_vectorsearch.py). Without it every query computes the cosine distance against every row.
+-- Build it after populate.py has filled the embeddings; recall vs. speed is tuned per session with
+-- SET hnsw.ef_search (default 40).
+CREATE INDEX IF NOT EXISTS idx_warehousedata_embedding_hnsw
+    ON "WarehouseData" USING hnsw (embedding vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
+
+-- Rate, docks and clear height are stored as text. The search compares them as numbers through the
+-- CASE expression built by _as_number() in tools/database_tool.py; indexing that exact expression lets
+-- the range filters use an index instead of regex-testing and casting every row.
+CREATE INDEX IF NOT EXISTS idx_warehouse_rate_per_sqft_num
+    ON "Warehouse" ((CASE WHEN "ratePerSqft" ~ '^[0-9]+(\.[0-9]+)?$' THEN "ratePerSqft"::numeric END));
+CREATE INDEX IF NOT EXISTS idx_warehouse_docks_num
+    ON "Warehouse" ((CASE WHEN "numberOfDocks" ~ '^[0-9]+(\.[0-9]+)?$' THEN "numberOfDocks"::numeric END));
+CREATE INDEX IF NOT EXISTS idx_warehouse_clear_height_num
+    ON "Warehouse" ((CASE WHEN "clearHeightFt" ~ '^[0-9]+(\.[0-9]+)?$' THEN "clearHeightFt"::numeric END));
+
+-- City, area (address), warehouse type, compliances, availability and zone are all matched with
+-- ILIKE '%value%'. A B-tree can't serve a leading wildcard, but a pg_trgm GIN index can, including the
+-- ILIKE ANY(:cities) form used for multi-city searches.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS idx_warehouse_city_trgm ON "Warehouse" USING gin (city gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_warehouse_address_trgm ON "Warehouse" USING gin (address gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_warehouse_type_trgm ON "Warehouse" USING gin ("warehouseType" gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_warehouse_compliances_trgm ON "Warehouse" USING gin (compliances gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_warehouse_availability_trgm ON "Warehouse" USING gin (availability gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_warehouse_zone_trgm ON "Warehouse" USING gin (zone gin_trgm_ops);
+
+-- State searches match the whole name case-insensitively, lower(w.state) = lower(:state), which a plain
+-- B-tree on the lowered column serves directly.
+CREATE INDEX IF NOT EXISTS idx_warehouse_state_lower ON "Warehouse" (lower(state));
+
+ANALYZE "Warehouse";
+ANALYZE "WarehouseData";
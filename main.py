@@ -5,6 +5,7 @@ from dotenv import load_dotenv
 import colorama
 from colorama import Fore, Style, Back
 import os
+import sys
 
 # --- DIAGNOSTIC TEST ---
 # 1. Load environment variables from the .env file
@@ -22,10 +23,15 @@ else:
 
 # 3. Only import the graph *after* the key has been verified
 from graph import create_warehouse_graph
+from utils.llm_client import close_http_client
+from tools.database_tool import close_pool
+from utils.log_setup import configure_logging
 
 async def run_cli_chatbot():
     """Main CLI chatbot interface."""
-    colorama.init()
+    # Strip ANSI colour codes when output is piped or captured to a log file
+    colorama.init(strip=not sys.stdout.isatty())
+    configure_logging()
     
     print(f"\n{Back.BLUE}{Fore.WHITE} 🏢 WAREHOUSE DISCOVERY AGENT (LangGraph) 🏢 {Style.RESET_ALL}")
     print(f"{Fore.YELLOW}Welcome! I'll help you find warehouse properties.{Style.RESET_ALL}")
@@ -47,6 +53,9 @@ async def run_cli_chatbot():
         print(f"\n{Fore.YELLOW}Conversation interrupted. Goodbye!{Style.RESET_ALL}")
     except Exception as e:
         print(f"\n{Fore.RED}An error occurred: {e}{Style.RESET_ALL}")
+    finally:
+        await close_http_client()
+        await close_pool()
 
 if __name__ == "__main__":
     asyncio.run(run_cli_chatbot())
\ No newline at end of file
@@ -1,32 +1,397 @@
 # nodes.py
+import asyncio
+import functools
 import json
+import logging
+import os
 import re
-from langchain_openai import ChatOpenAI
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import SystemMessage
+from langchain_core.callbacks import BaseCallbackHandler
 from colorama import Fore, Style
 
 from pydantic import BaseModel, Field
-from langchain_core.output_parsers import PydanticOutputParser
 
 from state import GraphState
-from tools.database_tool import find_warehouses_in_db
-from tools.location_tool import analyze_location_query
+from tools.database_tool import search_warehouses
+from utils.llm_client import LLM_TIMEOUT, LLM_MAX_RETRIES, get_http_client
+from tools.location_tool import LOCATION_MODEL, LOCATION_PROMPT_VERSION, analyze_location_query
 
-# Initialize LLM
-llm = ChatOpenAI(model="gpt-4o", temperature=0.7) # Slightly increased temp for more creative chat
+logger = logging.getLogger(__name__)
+
+def _agent_print(message: str, **kwargs):
+    """Show an agent reply on the console. This is the CLI's user-facing output, not logging."""
+    print(f"{Fore.GREEN}[AGENT]{Style.RESET_ALL} {message}", **kwargs)
+
+class _PromptCacheLogger(BaseCallbackHandler):
+    """Debug-log how much of each prompt OpenAI served from its prefix cache.
+
+    Every prompt here starts with a static system message so repeated calls share a cacheable
+    prefix; this makes the hit rate visible with LOG_LEVEL=DEBUG.
+    """
+    def on_llm_end(self, response, **kwargs):
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        if usage:
+            cached = (usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0)
+            logger.debug("Prompt tokens: %s (cached: %s)", usage.get("prompt_tokens"), cached)
+
+PROMPT_CACHE_LOGGER = _PromptCacheLogger()
+
+# LLMs are built on first use, so importing this module stays cheap (langchain_openai pulls in
+# the OpenAI SDK) and doesn't need an API key. Question generation and chit-chat are short
+# conversational turns, so the cheaper, faster mini model handles them; gpt-4o is only used
+# when the mini call fails
+@functools.cache
+def _get_llm():
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(
+        model="gpt-4o-mini",
+        temperature=0.7,  # Slightly increased temp for more creative chat
+        timeout=LLM_TIMEOUT,
+        max_retries=LLM_MAX_RETRIES,
+        http_async_client=get_http_client(),
+        callbacks=[PROMPT_CACHE_LOGGER],
+    )
+
+@functools.cache
+def _get_fallback_llm():
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(
+        model="gpt-4o",
+        temperature=0.7,
+        timeout=LLM_TIMEOUT,
+        max_retries=LLM_MAX_RETRIES,
+        http_async_client=get_http_client(),
+        callbacks=[PROMPT_CACHE_LOGGER],
+    )
+
+class _LazyChain:
+    """Module-level chain that is only built (and its LLM constructed) on first use."""
+    def __init__(self, build):
+        self._build = build
+        self._chain = None
+
+    def __getattr__(self, name):
+        if self._chain is None:
+            self._chain = self._build()
+        return getattr(self._chain, name)
+
+class RequirementsExtraction(BaseModel):
+    """Requirement fields extracted from a single user message. Unmentioned fields stay null."""
+    location_query: Optional[str] = Field(None, description="City, state or area the user wants to search in.")
+    size_min: Optional[int] = Field(None, description="Minimum warehouse size in square feet.")
+    size_max: Optional[int] = Field(None, description="Maximum warehouse size in square feet.")
+    budget_min: Optional[int] = Field(None, description="Minimum rate in rupees per square foot.")
+    budget_max: Optional[int] = Field(None, description="Maximum rate in rupees per square foot.")
+    warehouse_type: Optional[str] = Field(None, description="Structure type, either 'PEB' or 'RCC'.")
+    min_docks: Optional[int] = Field(None, description="Minimum number of loading docks.")
+    min_clear_height: Optional[int] = Field(None, description="Minimum clear height in feet.")
+    compliances_query: Optional[str] = Field(None, description="Non-fire compliance requirements.")
+    fire_noc_required: Optional[bool] = Field(None, description="Whether a fire NOC is required.")
+    availability: Optional[str] = Field(None, description="Availability need, e.g. 'immediate'.")
+    zone: Optional[str] = Field(None, description="Zone preference, e.g. 'industrial zone'.")
+    is_broker: Optional[bool] = Field(None, description="True for broker listings, False for owner listings.")
+
+# Extraction is pure information extraction, so a smaller deterministic model with
+# schema-enforced output is enough - no markdown fences or JSON rescue needed.
+@functools.cache
+def _get_extraction_llm():
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(
+        model="gpt-4o-mini",
+        temperature=0,
+        max_tokens=300,  # the full RequirementsExtraction object is ~150 tokens
+        timeout=LLM_TIMEOUT,
+        max_retries=LLM_MAX_RETRIES,
+        http_async_client=get_http_client(),
+        callbacks=[PROMPT_CACHE_LOGGER],
+    ).with_structured_output(RequirementsExtraction, method="json_schema")
+
+# Extraction runs at temperature 0, so the same chain on the same (normalized) message gives the
+# same fields. Short replies like "any size" or "industrial" repeat a lot; answer those from memory.
+# Entries are tasks, so an extraction started early can be awaited later without a second call.
+_extraction_cache: "OrderedDict[tuple, asyncio.Task]" = OrderedDict()
+MAX_EXTRACTION_CACHE = 2048
+
+def _task_reusable(task: asyncio.Task) -> bool:
+    """A cached task can be awaited again unless it failed or belongs to another event loop."""
+    if task.done():
+        return not task.cancelled() and task.exception() is None
+    return task.get_loop() is asyncio.get_running_loop()
+
+async def _run_extraction(chain, user_message: str) -> dict:
+    extraction = await chain.ainvoke({"message": user_message})
+    return extraction.model_dump(exclude_none=True)
+
+def _extraction_task(chain, user_message: str) -> asyncio.Task:
+    """Return the (possibly still running) extraction task for a message, starting one if needed."""
+    key = (id(chain), " ".join(user_message.split()).lower())
+    task = _extraction_cache.get(key)
+    if task is None or not _task_reusable(task):
+        task = _extraction_cache[key] = asyncio.create_task(_run_extraction(chain, user_message))
+        if len(_extraction_cache) > MAX_EXTRACTION_CACHE:
+            _extraction_cache.popitem(last=False)
+    _extraction_cache.move_to_end(key)
+    return task
+
+async def _extract_requirements(chain, user_message: str) -> dict:
+    """Run an extraction chain and return only the fields the model populated."""
+    # Copy so callers can't mutate the cached result
+    return dict(await _extraction_task(chain, user_message))
+
+class NextQuestion(BaseModel):
+    """The next question to ask the user to gather missing information."""
+    question: str = Field(description="A friendly, natural-sounding question to ask the user.")
+
+# Question generation only needs recent context; older turns are already captured in the
+# extracted requirements and the explicit "missing" list, so cap the history sent to the
+# gatherer LLM at the last three exchanges (3 user + 3 assistant messages)
+HISTORY_WINDOW = 6
+
+# Prompts and chains below are pure functions of module constants, so they are built once.
+# Questions come back as a schema-enforced NextQuestion, so the prompt carries no format
+# instructions and there is no free-text parsing step to fail.
+def _question_chain(prompt: ChatPromptTemplate):
+    """Question-generation chain on the mini model, retried on gpt-4o if the call fails."""
+    primary = prompt | _get_llm().with_structured_output(NextQuestion, method="json_schema")
+    fallback = prompt | _get_fallback_llm().with_structured_output(NextQuestion, method="json_schema")
+    return primary.with_fallbacks([fallback])
+
+# Word-bounded so "start" doesn't fire on "starting over" and "yes" doesn't fire on "yesterday"
+AFFIRMATIVE_RE = re.compile(r"\b(?:yes|yep|sure|correct|confirm|looks good|do it|start)\b", re.IGNORECASE)
+PAGINATION_RE = re.compile(r"(?:more|next|show more)")
+# Whole-message replies, compared after lowercasing and trimming trailing punctuation
+NO_REQUIREMENTS_REPLIES = frozenset({"none", "no", "nothing", "no requirements", "that's all"})
+SIMPLE_CONFIRMATIONS = frozenset({"yes", "yep", "sure", "correct", "ok", "okay"})
+MAX_PAGES = 10
+SIZE_DEVIATION = 0.20  # a single target size is searched as ±20%
+
+# Fast-path grammars for replies that are *only* a size, a budget or a place ("50k sqft",
+# "20-30 per sqft", "in Pune", "50k sqft in Pune"). Anything else still goes to the extraction LLM.
+_SQFT_UNIT = r"(?:sq\.?\s*ft|sqft|sft|square\s*f(?:ee|oo)t)"
+SIZE_ONLY_RE = re.compile(
+    r"(?:(?P<qual>at least|minimum|min|above|more than|up to|upto|maximum|max|under|below|less than)\s+)?"
+    r"(?P<low>\d[\d,]*)\s*(?P<low_k>k)?\s*" + _SQFT_UNIT + r"?"
+    r"(?:\s*(?:-|to)\s*(?P<high>\d[\d,]*)\s*(?P<high_k>k)?\s*" + _SQFT_UNIT + r"?)?",
+    re.IGNORECASE,
+)
+BUDGET_ONLY_RE = re.compile(
+    r"(?:(?:budget|rate|price|rent)\s*(?:of|is|:)?\s*)?"
+    r"(?:(?P<qual>at least|minimum|min|above|up to|upto|maximum|max|under|below|not more than)\s*)?"
+    r"(?:rs\.?|₹|inr)?\s*(?P<low>\d[\d,]*)"
+    r"(?:\s*(?:-|to)\s*(?:rs\.?|₹|inr)?\s*(?P<high>\d[\d,]*))?"
+    r"\s*(?:(?:/|per)\s*" + _SQFT_UNIT + r")?",
+    re.IGNORECASE,
+)
+_MIN_QUALIFIERS = {"at least", "minimum", "min", "above", "more than"}
+
+# Which words are a place isn't decided from a list: a candidate is only taken as the location
+# when the location tool has already analyzed it (see _is_known_location)
+PLACE_ONLY_RE = re.compile(r"(?:in\s+)?(?P<place>[^\W\d_][\w .,'-]*)", re.IGNORECASE)
+SIZE_IN_PLACE_RE = re.compile(r"(?P<size>.+?)\s+(?:in|at|near|around)\s+(?P<place>[^\W\d_][\w .,'-]*)", re.IGNORECASE)
+
+def _fast_extract_size(user_message: str):
+    """Parse a size-only reply without the LLM. Returns None when the message needs the LLM."""
+    match = SIZE_ONLY_RE.fullmatch(user_message.strip())
+    if not match:
+        return None
+    low = int(match["low"].replace(",", "")) * (1000 if match["low_k"] else 1)
+    if match["high"]:
+        high = int(match["high"].replace(",", "")) * (1000 if match["high_k"] else 1)
+        if match["high_k"] and not match["low_k"] and low < 1000:
+            low *= 1000  # "20-30k" means 20k-30k
+        return {"size_min": low, "size_max": high}
+    qualifier = (match["qual"] or "").lower()
+    if qualifier in _MIN_QUALIFIERS:
+        return {"size_min": low}
+    if qualifier:
+        return {"size_max": low}
+    # A bare number is a single target size; callers widen min == max into a range
+    return {"size_min": low, "size_max": low}
+
+def _fast_extract_area_size(user_message: str):
+    """Parse a known place, a size, or "<size> in <place>" without the LLM. Returns None when the LLM is needed."""
+    message = user_message.strip().rstrip(".!")
+    size = _fast_extract_size(message)
+    if size is not None:
+        return size
+    match = SIZE_IN_PLACE_RE.fullmatch(message)
+    if match:
+        size = _fast_extract_size(match["size"])
+        if size is None or not _is_known_location(match["place"]):
+            return None
+        return {"location_query": match["place"].strip(), **size}
+    match = PLACE_ONLY_RE.fullmatch(message)
+    if match and _is_known_location(match["place"]):
+        return {"location_query": match["place"].strip()}
+    return None
+
+def _size_range(size: int):
+    """Widen a single target size into the (min, max) range searched for it."""
+    return int(size * (1 - SIZE_DEVIATION)), int(size * (1 + SIZE_DEVIATION))
+
+# Keyword lists are matched as plain substrings, exactly like `any(kw in message for kw in ...)`,
+# but each list is compiled once into a single alternation so a check is one regex scan
+def _keyword_re(*keywords):
+    return re.compile("|".join(map(re.escape, keywords)))
+
+# Keyword gates deciding which extraction LLMs a specifics-stage message needs
+BUDGET_KEYWORDS_RE = _keyword_re(
+    "budget", "price", "rate", "cost", "₹", "rupees", "per sqft", "/sqft", "rent", "rental",
+    "lease rate", "monthly rent", "pricing", "charges", "expense", "fees", "payment", "amount",
+    "money", "financial", "affordable"
+)
+VAGUE_BUDGET_RE = _keyword_re(
+    "as per market", "market rate", "depends", "flexible", "negotiate", "reasonable", "fair price",
+    "market price", "standard rate", "competitive", "discuss", "talk about price", "let's see",
+    "open to negotiate"
+)
+SPEC_KEYWORDS_RE = _keyword_re(
+    "dock", "height", "warehouse type", "structure", "peb", "rcc", "compliance", "availability",
+    "zone", "broker", "loading", "clear height", "ceiling"
+)
+SIZE_KEYWORDS_RE = _keyword_re("size", "sqft", "square feet", "area", "space")
+
+# update_state_node routing and stage replies
+EXPLICIT_CHANGE_RE = _keyword_re("make", "change", "set", "update", "new")
+PARAMETER_RE = _keyword_re("budget", "size", "price", "rate", "cost", "sqft")
+LOCATION_SWITCH_RE = _keyword_re("make city", "change city", "switch to", "move to")
+LOCATION_CHANGE_RE = _keyword_re(
+    "switch to", "change to", "make city", "change city", "move to", "find in", "search in",
+    "show in", "warehouses in", "similar in", "update location", "new location"
+)
+RELAXATION_RE = _keyword_re("relax", "expand", "loosen", "more options")
+SEARCH_ELSEWHERE_RE = _keyword_re("warehouses in", "similar in", "show in", "find in", "search in")
+ALL_WAREHOUSES_RE = _keyword_re("all warehouses", "show all", "any size", "all available")
+INDUSTRIAL_REPLY_RE = _keyword_re("industrial", "yes", "manufacturing", "processing")
+COMMERCIAL_REPLY_RE = _keyword_re("commercial", "no", "distribution", "storage")
+
+# Legacy keyword fallbacks
+MIN_QUALIFIER_RE = _keyword_re("at least", "minimum", "min", "above", "more than")
+MAX_QUALIFIER_RE = _keyword_re("up to", "maximum", "max", "below", "less than", "under")
+FIRE_NOC_RE = _keyword_re(
+    "fire noc", "fire clearance", "fire compliance", "fire certificate", "noc", "fire safety",
+    "fire approval", "fire permit", "fire license"
+)
+FIRE_NOC_WANTED_RE = _keyword_re(
+    "yes", "required", "need", "must have", "want", "should have", "make it have", "add", "include",
+    "with", "ensure", "necessary", "mandatory", "compulsory", "essential", "needed", "requires",
+    "please add", "make sure", "prefer", "looking for", "seeking"
+)
+FIRE_NOC_UNWANTED_RE = _keyword_re(
+    "no", "not required", "don't need", "optional", "without", "remove", "exclude", "don't want",
+    "skip", "ignore", "avoid", "not necessary", "no need", "not interested", "doesn't matter"
+)
+WAREHOUSE_TYPE_RE = _keyword_re(
+    "warehouse type", "structure", "construction", "peb", "rcc", "shed type", "building type",
+    "structure type", "construction type", "material"
+)
+PEB_RE = _keyword_re("peb", "pre-engineered", "pre engineered", "steel structure", "metal building")
+RCC_RE = _keyword_re(
+    "rcc", "concrete", "cement", "reinforced concrete", "brick", "solid construction"
+)
+NO_PREFERENCE_RE = _keyword_re(
+    "any", "both", "either", "flexible", "doesn't matter", "open to both", "not particular",
+    "whatever", "any type", "no preference"
+)
+DOCKS_RE = _keyword_re(
+    "dock", "loading dock", "loading bay", "loading platform", "docks", "loading bays",
+    "truck dock", "vehicle loading", "loading area", "loading zone", "bay", "platform"
+)
+NO_DOCKS_RE = _keyword_re(
+    "no dock", "without dock", "zero dock", "0 dock", "no loading dock", "no bays",
+    "without loading", "no platform", "don't need dock", "no loading bay", "skip dock",
+    "avoid dock"
+)
+CLEAR_HEIGHT_RE = _keyword_re(
+    "height", "clear height", "ceiling height", "clearance", "headroom", "vertical clearance",
+    "roof height", "minimum height", "overhead clearance"
+)
+LAND_TYPE_RE = _keyword_re(
+    "land type", "land classification", "zoning", "industrial land", "commercial land",
+    "industrial zone", "commercial zone", "land use", "property type"
+)
+INDUSTRIAL_RE = _keyword_re(
+    "industrial", "manufacturing", "production", "factory", "industry", "industrial zone",
+    "industrial area", "manufacturing zone"
+)
+COMMERCIAL_RE = _keyword_re(
+    "commercial", "distribution", "storage", "warehouse", "logistics", "commercial zone",
+    "distribution center", "storage facility"
+)
+
+# Criteria relaxation topics in priority order: when a message names several, the first listed wins
+RELAX_KEYWORDS = (
+    ("size", ("size", "sqft", "square feet", "bigger", "smaller")),
+    ("land_type", ("land type", "land", "industrial", "commercial")),
+    ("budget", ("budget", "price", "rate", "cost", "cheaper", "expensive")),
+    ("fire_noc", ("fire noc", "fire", "noc", "compliance")),
+    ("warehouse_type", ("type", "structure", "peb", "rcc", "shed")),
+    ("all", ("all", "everything", "any", "general", "loosen")),
+)
+_RELAX_CATEGORY = {keyword: category for category, keywords in RELAX_KEYWORDS for keyword in keywords}
+_RELAX_PRIORITY = {category: rank for rank, (category, _) in enumerate(RELAX_KEYWORDS)}
+# One scan for every topic; the lookahead tries each position, so overlapping keywords are all seen
+RELAX_KEYWORD_RE = re.compile("(?=(" + "|".join(map(re.escape, _RELAX_CATEGORY)) + "))")
+
+def _relaxation_category(user_message_lower: str) -> Optional[str]:
+    """The highest-priority relaxation topic mentioned in the message, if any."""
+    found = {_RELAX_CATEGORY[match.group(1)] for match in RELAX_KEYWORD_RE.finditer(user_message_lower)}
+    return min(found, key=_RELAX_PRIORITY.__getitem__, default=None)
+
+# Number grabbers for the regex fallbacks when the extraction LLM fails or misses a field
+BUDGET_RANGE_RE = re.compile(r'(\d+)\s*(?:to|-)\s*(\d+)')
+BUDGET_VALUE_RE = re.compile(r'₹?(\d+(?:,\d{3})*(?:\.\d+)?)')
+DOCK_COUNT_RE = re.compile(r'(\d+)\s*(?:dock|loading|bay|platform)')
+CLEAR_HEIGHT_VALUE_RE = re.compile(r'(\d+(?:\.\d+)?)\s*(?:ft|feet|foot|meter|metres|meters|m)\b')
+# Search tool parameter -> GraphState field; unset (None) fields are left out of the query
+SEARCH_PARAM_FIELDS = (
+    ("cities", "parsed_cities"), ("state", "parsed_state"), ("search_area", "search_area"),
+    ("search_address", "search_address"), ("is_area_search", "is_area_search"),
+    ("min_sqft", "size_min"), ("max_sqft", "size_max"),
+    ("min_rate_per_sqft", "budget_min"), ("max_rate_per_sqft", "budget_max"),
+    ("warehouse_type", "warehouse_type"), ("compliances", "compliances_query"),
+    ("min_docks", "min_docks"), ("min_clear_height", "min_clear_height"),
+    ("availability", "availability"), ("zone", "zone"), ("is_broker", "is_broker"),
+    ("fire_noc_required", "fire_noc_required"), ("land_type_industrial", "land_type_industrial"),
+)
+
+def _mentions_budget(user_message_lower: str) -> bool:
+    """True when the user is talking about a concrete budget rather than deferring to the market."""
+    return bool(BUDGET_KEYWORDS_RE.search(user_message_lower)
+                and not VAGUE_BUDGET_RE.search(user_message_lower))
+
+def _fast_extract_budget(user_message: str):
+    """Parse a budget-only reply without the LLM. Returns None when the message needs the LLM."""
+    match = BUDGET_ONLY_RE.fullmatch(user_message.strip())
+    if not match:
+        return None
+    low = int(match["low"].replace(",", ""))
+    if match["high"]:
+        return {"budget_min": low, "budget_max": int(match["high"].replace(",", ""))}
+    if (match["qual"] or "").lower() in _MIN_QUALIFIERS:
+        return {"budget_min": low}
+    # Single numbers and "up to" style qualifiers are both treated as a ceiling
+    return {"budget_max": low}
 
 # ============================ GREETING NODE STARTS HERE ============================
 async def greeting_node(state: GraphState) -> GraphState:
     """Initial greeting node that welcomes the user and explains what the agent can do."""
-    print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Starting with greeting...")
+    logger.debug("Starting with greeting...")
     
     greeting_message = (
         "Hi! Let's find the right spot for your business. To begin, where are you looking for a warehouse?"
     )
     
     state.add_message("assistant", greeting_message)
-    print(f"{Fore.GREEN}[AGENT]{Style.RESET_ALL} {greeting_message}")
+    _agent_print(greeting_message)
     
     state.workflow_stage = "area_and_size"
     state.next_action = "wait_for_user"
@@ -34,72 +399,59 @@ async def greeting_node(state: GraphState) -> GraphState:
 # ============================ GREETING NODE ENDS HERE ============================
 
 # ============================ STAGE-SPECIFIC NODES START HERE ============================
+AREA_SIZE_QUESTION_SYSTEM_PROMPT = """You are a friendly warehouse assistant collecting location and size requirements.
+
+In this stage, you need to collect:
+- Location (city or state)
+- Size requirements (square footage)
+
+Ask ONE question at a time. Be conversational and helpful.
+Focus on the most important missing requirement first."""
+
+AREA_SIZE_QUESTION_CHAIN = _LazyChain(lambda: _question_chain(ChatPromptTemplate.from_messages([
+    SystemMessage(content=AREA_SIZE_QUESTION_SYSTEM_PROMPT),
+    ("human", "Here is the conversation history so far:\n---\n{history}\n---\nMissing requirements in this stage: {missing}\n\nWhat should I ask next?")
+])))
+
 async def area_size_gatherer_node(state: GraphState) -> GraphState:
     """Stage 1: Gather location and size requirements."""
-    print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Stage 1: Gathering area and size...")
-    print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Current state - Location: {state.location_query}, Size: {state.size_min}-{state.size_max}")
+    logger.debug("Stage 1: Gathering area and size...")
+    logger.debug("Current state - Location: %s, Size: %s-%s", state.location_query, state.size_min, state.size_max)
     
     missing_requirements = state.get_missing_requirements()
-    print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Missing requirements: {missing_requirements}")
+    logger.debug("Missing requirements: %s", missing_requirements)
     
     if not missing_requirements:
         # Both location and size are collected, move to next stage
-        print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} All requirements collected, advancing to business nature stage")
+        logger.debug("All requirements collected, advancing to business nature stage")
         state.advance_workflow_stage()
         state.next_action = "gather_business_nature"
         return state
 
-    # Use a PydanticOutputParser to get structured output
-    parser = PydanticOutputParser(pydantic_object=NextQuestion)
-
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", """You are a friendly warehouse assistant collecting location and size requirements.
-        
-        In this stage, you need to collect:
-        - Location (city or state)
-        - Size requirements (square footage)
-        
-        Ask ONE question at a time. Be conversational and helpful.
-        Focus on the most important missing requirement first.
-        
-        {format_instructions}"""),
-        ("human", """Here is the conversation history so far:
-        ---
-        {history}
-        ---
-        Missing requirements in this stage: {missing}
-        
-        What should I ask next?""")
-    ])
-    
-    # Format the history for the prompt
-    history = "\n".join([f"{msg['role'].title()}: {msg['content']}" for msg in state.messages])
-    
-    chain = prompt | llm | parser
+    history = state.get_history(HISTORY_WINDOW)
     
     try:
-        next_question_model = await chain.ainvoke({
+        next_question_model = await AREA_SIZE_QUESTION_CHAIN.ainvoke({
             "history": history,
             "missing": ", ".join(missing_requirements),
-            "format_instructions": parser.get_format_instructions()
         })
         question = next_question_model.question
     except Exception as e:
-        print(f"{Fore.RED}[ERROR]{Style.RESET_ALL} Failed to generate question: {e}")
+        logger.error("Failed to generate question: %s", e)
         if "location" in missing_requirements:
             question = "What city or location are you looking for a warehouse in?"
         else:
             question = "How much space do you need? Please specify in square feet."
 
     state.add_message("assistant", question)
-    print(f"{Fore.GREEN}[AGENT]{Style.RESET_ALL} {question}")
+    _agent_print(question)
     
     state.next_action = "wait_for_user"
     return state
 
 async def business_nature_gatherer_node(state: GraphState) -> GraphState:
     """Stage 2: Ask about industrial land CLU requirement."""
-    print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Stage 2: Asking about industrial land CLU...")
+    logger.debug("Stage 2: Asking about industrial land CLU...")
     
     if state.land_type_industrial is not None:
         # Already have land type preference, move to next stage
@@ -113,14 +465,14 @@ async def business_nature_gatherer_node(state: GraphState) -> GraphState:
                "Please specify: industrial or commercial")
     
     state.add_message("assistant", question)
-    print(f"{Fore.GREEN}[AGENT]{Style.RESET_ALL} {question}")
+    _agent_print(question)
     
     state.next_action = "wait_for_user"
     return state
 
 async def specifics_gatherer_node(state: GraphState) -> GraphState:
     """Stage 3: Gather specific requirements like compliances, budget, etc."""
-    print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Stage 3: Gathering specific requirements...")
+    logger.debug("Stage 3: Gathering specific requirements...")
     
     question = ("Additional requirements:\n\n"
                "• Fire NOC compliance\n"
@@ -131,60 +483,67 @@ async def specifics_gatherer_node(state: GraphState) -> GraphState:
                "Please specify your requirements, or type 'none' if not applicable.")
     
     state.add_message("assistant", question)
-    print(f"{Fore.GREEN}[AGENT]{Style.RESET_ALL} {question}")
+    _agent_print(question)
     
     state.next_action = "wait_for_user"
     return state
 # ============================ STAGE-SPECIFIC NODES END HERE ============================
 
 # ============================ NEW NODE STARTS HERE ============================
+CHIT_CHAT_CHAIN = _LazyChain(lambda: ChatPromptTemplate.from_messages([
+    SystemMessage(
+        content="You are a friendly, conversational real estate assistant. The user said something that isn't a direct answer to your question. "
+                "Provide a brief, natural-sounding acknowledgement and then gently re-ask your last question to get the conversation back on track."
+    ),
+    ("ai", "This was my last question to the user: {last_agent_question}"),
+    ("human", "This was the user's reply: {last_user_message}")
+]) | _get_llm())
+
 async def chit_chat_node(state: GraphState) -> GraphState:
     """Handles conversational filler and generates a natural response."""
-    print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Generating a chit-chat response...")
+    logger.debug("Generating a chit-chat response...")
 
     # Get the last user message and the last agent question
-    last_user_message = ""
-    last_agent_question = ""
-    for msg in reversed(state.messages):
-        if msg["role"] == "user" and not last_user_message:
-            last_user_message = msg["content"]
-        if msg["role"] == "assistant" and not last_agent_question:
-            last_agent_question = msg["content"]
-        if last_user_message and last_agent_question:
-            break
-
-    prompt = ChatPromptTemplate.from_messages([
-        SystemMessage(
-            content="You are a friendly, conversational real estate assistant. The user said something that isn't a direct answer to your question. "
-                    "Provide a brief, natural-sounding acknowledgement and then gently re-ask your last question to get the conversation back on track."
-        ),
-        ("ai", f"This was my last question to the user: {last_agent_question}"),
-        ("human", f"This was the user's reply: {last_user_message}")
-    ])
-    
-    chain = prompt | llm
-    response = await chain.ainvoke({})
-    
-    response_text = response.content
+    last_user_message = state.last_user_message or ""
+    last_agent_question = state.last_assistant_message or ""
+
+    # Stream tokens to the console as they arrive instead of waiting for the full reply
+    chunks = []
+    _agent_print("", end="", flush=True)
+    async for chunk in CHIT_CHAT_CHAIN.astream({
+        "last_agent_question": last_agent_question,
+        "last_user_message": last_user_message,
+    }):
+        print(chunk.content, end="", flush=True)
+        chunks.append(chunk.content)
+    print()
+    
+    response_text = "".join(chunks)
     state.add_message("assistant", response_text)
-    print(f"{Fore.GREEN}[AGENT]{Style.RESET_ALL} {response_text}")
 
     state.next_action = "wait_for_user"
     return state
 # ============================= NEW NODE ENDS HERE =============================
 
-from pydantic import BaseModel, Field
-from langchain_core.output_parsers import PydanticOutputParser
+NEXT_QUESTION_SYSTEM_PROMPT = """You are a friendly and highly intelligent real estate assistant.
+Your goal is to gather a user's requirements for a warehouse.
+You have the conversation history and a list of requirements you still need to collect.
 
-# (Add these imports at the top of nodes.py)
+Based on this information, formulate the single best question to ask the user next.
+
+- Be conversational and not robotic.
+- Prioritize gathering the most important information first (location, then size).
+- Do not ask for multiple things at once.
+- Keep your questions brief and to the point."""
+
+NEXT_QUESTION_CHAIN = _LazyChain(lambda: _question_chain(ChatPromptTemplate.from_messages([
+    SystemMessage(content=NEXT_QUESTION_SYSTEM_PROMPT),
+    ("human", "Here is the conversation history so far:\n---\n{history}\n---\nHere are the requirements we still need to collect: {missing}\n\nWhat is the best next question to ask?")
+])))
 
-class NextQuestion(BaseModel):
-    """The next question to ask the user to gather missing information."""
-    question: str = Field(description="A friendly, natural-sounding question to ask the user.")
-    
 async def requirements_gatherer_node(state: GraphState) -> GraphState:
     """Node that dynamically generates the next question to ask the user using an LLM."""
-    print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Dynamically generating next question...")
+    logger.debug("Dynamically generating next question...")
     
     missing_requirements = state.get_missing_requirements()
     
@@ -192,57 +551,29 @@ async def requirements_gatherer_node(state: GraphState) -> GraphState:
         state.next_action = "confirm_requirements"
         return state
 
-    # Use a PydanticOutputParser to get structured output
-    parser = PydanticOutputParser(pydantic_object=NextQuestion)
-
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", """You are a friendly and highly intelligent real estate assistant. 
-        Your goal is to gather a user's requirements for a warehouse. 
-        You have the conversation history and a list of requirements you still need to collect.
-
-        Based on this information, formulate the single best question to ask the user next.
-
-        - Be conversational and not robotic.
-        - Prioritize gathering the most important information first (location, then size).
-        - Do not ask for multiple things at once.
-        - Keep your questions brief and to the point.
-        
-        {format_instructions}"""),
-        ("human", """Here is the conversation history so far:
-        ---
-        {history}
-        ---
-        Here are the requirements we still need to collect: {missing}
-        
-        What is the best next question to ask?""")
-    ])
-    
-    # Format the history for the prompt
-    history = "\n".join([f"{msg['role'].title()}: {msg['content']}" for msg in state.messages])
-    
-    chain = prompt | llm | parser
+    history = state.get_history(HISTORY_WINDOW)
     
     try:
-        next_question_model = await chain.ainvoke({
+        next_question_model = await NEXT_QUESTION_CHAIN.ainvoke({
             "history": history,
             "missing": ", ".join(missing_requirements),
-            "format_instructions": parser.get_format_instructions()
         })
         question = next_question_model.question
     except Exception as e:
-        print(f"{Fore.RED}[ERROR]{Style.RESET_ALL} Failed to generate dynamic question: {e}")
+        logger.error("Failed to generate dynamic question: %s", e)
         # Fallback to the simple hardcoded question if the LLM fails
         question = "Sorry, I had a brief issue. What other requirements do you have?"
 
     state.add_message("assistant", question)
-    print(f"{Fore.GREEN}[AGENT]{Style.RESET_ALL} {question}")
+    _agent_print(question)
     
     state.next_action = "wait_for_user"
     return state
 
 async def update_state_node(state: GraphState) -> GraphState:
     """Node that parses user input and updates the state based on current workflow stage."""
-    if not state.messages or state.messages[-1]["role"] != "user":
+    last_msg = state.messages[-1] if state.messages else None
+    if last_msg is None or last_msg["role"] != "user":
         # Determine which stage we should go to
         if state.workflow_stage == "area_and_size":
             state.next_action = "gather_area_size"
@@ -252,15 +583,14 @@ async def update_state_node(state: GraphState) -> GraphState:
             state.next_action = "gather_specifics"
         return state
     
-    user_message = state.messages[-1]["content"]
+    user_message = last_msg["content"]
     user_message_lower = user_message.lower()
-    print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Parsing user input in {state.workflow_stage} stage: '{user_message}'")
+    logger.debug("Parsing user input in %s stage: '%s'", state.workflow_stage, user_message)
     
     # Handle confirmation for search - ONLY when we're waiting for confirmation
-    affirmative_keywords = ["yes", "yep", "sure", "correct", "confirm", "looks good", "do it", "start"]
-    has_affirmative = any(keyword in user_message_lower for keyword in affirmative_keywords)
+    has_affirmative = AFFIRMATIVE_RE.search(user_message) is not None
     
-    print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Confirmation check - Has affirmative: {has_affirmative}, Stage: {state.workflow_stage}, Requirements confirmed: {state.requirements_confirmed}")
+    logger.debug("Confirmation check - Has affirmative: %s, Stage: %s, Requirements confirmed: %s", has_affirmative, state.workflow_stage, state.requirements_confirmed)
     
     if (has_affirmative and 
         state.workflow_stage == "specifics" and 
@@ -273,31 +603,30 @@ async def update_state_node(state: GraphState) -> GraphState:
         found_confirmation_message = False
         
         # Debug: Show recent messages
-        print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Recent messages in state:")
+        logger.debug("Recent messages in state:")
         for i, msg in enumerate(reversed(state.messages[-5:])):
-            print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL}   {4-i}: {msg['role']}: {msg['content'][:100]}...")
+            logger.debug("%s: %s: %s...", 4-i, msg['role'], msg['content'][:100])
             if msg["role"] == "assistant" and ("Are these parameters fine?" in msg["content"] or "Proceed with search?" in msg["content"]):
                 found_confirmation_message = True
-                print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Found confirmation message in recent history")
+                logger.debug("Found confirmation message in recent history")
         
-        print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Checking confirmation - Found confirmation message in recent messages: {found_confirmation_message}")
-        print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Current requirements_confirmed: {state.requirements_confirmed}")
+        logger.debug("Checking confirmation - Found confirmation message in recent messages: %s", found_confirmation_message)
+        logger.debug("Current requirements_confirmed: %s", state.requirements_confirmed)
         
         if found_confirmation_message:
-            print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Confirming search and proceeding to database search")
+            logger.debug("Confirming search and proceeding to database search")
             state.requirements_confirmed = True
             state.next_action = "search_database"
             return state
         else:
-            print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Not a search confirmation context")
+            logger.debug("Not a search confirmation context")
     
     # Handle pagination for search results
-    if user_message_lower in ["more", "next", "show more"]:
-        MAX_PAGES = 10
+    if PAGINATION_RE.fullmatch(user_message_lower.strip(" .!")):
         if state.current_page >= MAX_PAGES:
             response_message = f"📄 You've reached the maximum number of pages ({MAX_PAGES}). If you'd like to refine your search or try different criteria, just let me know!"
             state.add_message("assistant", response_message)
-            print(f"{Fore.GREEN}[AGENT]{Style.RESET_ALL} {response_message}")
+            _agent_print(response_message)
             state.next_action = "wait_for_user"
             return state
         
@@ -313,17 +642,16 @@ async def update_state_node(state: GraphState) -> GraphState:
     parameter_update_keywords = ["make budget", "change budget", "set budget", "new budget", 
                                 "make size", "change size", "set size", "new size",
                                 "update budget", "update size"]
-    explicit_change_keywords = ["make", "change", "set", "update", "new"]
     
     # Check if this is an explicit parameter update (not normal workflow response)
-    has_explicit_change = any(keyword in user_message_lower for keyword in explicit_change_keywords)
-    has_parameter = any(keyword in user_message_lower for keyword in ["budget", "size", "price", "rate", "cost", "sqft"])
-    is_location_change = any(keyword in user_message_lower for keyword in ["make city", "change city", "switch to", "move to"])
+    has_explicit_change = EXPLICIT_CHANGE_RE.search(user_message_lower)
+    has_parameter = PARAMETER_RE.search(user_message_lower)
+    is_location_change = LOCATION_SWITCH_RE.search(user_message_lower)
     
     if (has_explicit_change and has_parameter and not is_location_change and 
         state.workflow_stage == "specifics"):  # Only in specifics stage for parameter updates
         # Parse parameter updates 
-        await _parse_specific_requirements(state, user_message)
+        await _parse_specific_requirements(state, user_message, user_message_lower)
         # Show updated requirements summary
         await _show_updated_requirements(state)
         # Wait for user confirmation (next_action set by _show_updated_requirements)
@@ -331,10 +659,7 @@ async def update_state_node(state: GraphState) -> GraphState:
 
     # Check for location changes only AFTER the initial stages (not during area_and_size stage)
     if state.workflow_stage != "area_and_size":
-        location_change_keywords = ["switch to", "change to", "make city", "change city", "move to", 
-                                   "find in", "search in", "show in", "warehouses in", "similar in",
-                                   "update location", "new location"]
-        if any(keyword in user_message_lower for keyword in location_change_keywords):
+        if LOCATION_CHANGE_RE.search(user_message_lower):
             # Parse the new location
             await _parse_location_change(state, user_message)
             # Go directly to search with new location
@@ -343,38 +668,37 @@ async def update_state_node(state: GraphState) -> GraphState:
 
     # Stage-specific parsing
     if state.workflow_stage == "area_and_size":
-        await _parse_area_size_requirements(state, user_message)
+        await _parse_area_size_requirements(state, user_message, user_message_lower)
     elif state.workflow_stage == "land_type_preference":
-        await _parse_business_nature(state, user_message)
+        await _parse_business_nature(state, user_message, user_message_lower)
     elif state.workflow_stage == "specifics":
-        await _parse_specific_requirements(state, user_message)
+        await _parse_specific_requirements(state, user_message, user_message_lower)
     
     # Handle criteria relaxation requests (when user wants to expand search) - more specific keywords
-    relaxation_keywords = ["relax", "expand", "loosen", "more options"]
-    if any(keyword in user_message_lower for keyword in relaxation_keywords):
-        await _handle_criteria_relaxation(state, user_message)
+    if RELAXATION_RE.search(user_message_lower):
+        await _handle_criteria_relaxation(state, user_message, user_message_lower)
         # After relaxing criteria, search again
         state.next_action = "search_database"
         return state
     
     # Check if we can advance to next stage
-    print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Checking if ready for next stage. Current stage: {state.workflow_stage}")
-    print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Location: {state.location_query}, Size: {state.size_min}-{state.size_max}")
+    logger.debug("Checking if ready for next stage. Current stage: %s", state.workflow_stage)
+    logger.debug("Location: %s, Size: %s-%s", state.location_query, state.size_min, state.size_max)
     
     is_ready = state.is_ready_for_next_stage()
-    print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Is ready for next stage: {is_ready}")
+    logger.debug("Is ready for next stage: %s", is_ready)
     
     if is_ready:
         if state.workflow_stage == "area_and_size":
-            print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Advancing from area_and_size to land_type_preference")
+            logger.debug("Advancing from area_and_size to land_type_preference")
             state.advance_workflow_stage()
             state.next_action = "gather_business_nature"
         elif state.workflow_stage == "land_type_preference":
-            print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Advancing from land_type_preference to specifics")
+            logger.debug("Advancing from land_type_preference to specifics")
             state.advance_workflow_stage()
             state.next_action = "gather_specifics"
         elif state.workflow_stage == "specifics":
-            print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Moving to confirmation")
+            logger.debug("Moving to confirmation")
             # Ready for confirmation - but only if not already confirmed and not already set to search
             if not state.requirements_confirmed and state.next_action != "search_database":
                 state.next_action = "confirm_requirements"
@@ -382,7 +706,7 @@ async def update_state_node(state: GraphState) -> GraphState:
                 # Already confirmed or already set to search, should search
                 state.next_action = "search_database"
     else:
-        print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Not ready, staying in current stage")
+        logger.debug("Not ready, staying in current stage")
         # Stay in current stage
         if state.workflow_stage == "area_and_size":
             state.next_action = "gather_area_size"
@@ -393,36 +717,33 @@ async def update_state_node(state: GraphState) -> GraphState:
     
     return state
 
-async def _parse_area_size_requirements(state: GraphState, user_message: str):
+AREA_SIZE_EXTRACTION_SYSTEM_PROMPT = """Extract location and size requirements from user message.
+
+Instructions:
+1. For location: extract city/state names
+2. For size: handle ranges, "up to", "at least", single numbers, "k" abbreviations (50k = 50000)
+3. If user says "all warehouses" or "any size", set size fields to null"""
+
+AREA_SIZE_EXTRACTION_CHAIN = _LazyChain(lambda: ChatPromptTemplate.from_messages([
+    SystemMessage(content=AREA_SIZE_EXTRACTION_SYSTEM_PROMPT),
+    ("user", "Extract requirements: {message}")
+]) | _get_extraction_llm())
+
+async def _parse_area_size_requirements(state: GraphState, user_message: str, user_message_lower: str):
     """Parse location and size requirements from user message."""
-    print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Parsing area/size from: '{user_message}'")
-    
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", """Extract location and size requirements from user message. 
-        Return ONLY a raw JSON object:
-        {{"location_query": null, "size_min": null, "size_max": null}}
-        
-        Instructions:
-        1. For location: extract city/state names
-        2. For size: handle ranges, "up to", "at least", single numbers, "k" abbreviations (50k = 50000)
-        3. If user says "all warehouses" or "any size", set size fields to null"""),
-        ("user", "Extract requirements: {message}")
-    ])
+    logger.debug("Parsing area/size from: '%s'", user_message)
     
     try:
-        chain = prompt | llm
-        response = await chain.ainvoke({"message": user_message})
-        content = response.content.strip()
-        json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', content, re.DOTALL)
-        json_str = json_match.group(1) if json_match else content
-        parsed_data = json.loads(json_str)
+        parsed_data = _fast_extract_area_size(user_message)
+        if parsed_data is None:
+            parsed_data = await _extract_requirements(AREA_SIZE_EXTRACTION_CHAIN, user_message)
         
-        print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Parsed data: {parsed_data}")
+        logger.debug("Parsed data: %s", parsed_data)
         
         # Update location
         if parsed_data.get("location_query"):
             state.location_query = parsed_data["location_query"]
-            print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Updated location: {state.location_query}")
+            logger.debug("Updated location: %s", state.location_query)
             # Clear parsed cities so it gets re-processed through location tool
             state.parsed_cities = None
             state.parsed_state = None
@@ -431,87 +752,91 @@ async def _parse_area_size_requirements(state: GraphState, user_message: str):
         parsed_min_val = parsed_data.get("size_min")
         parsed_max_val = parsed_data.get("size_max")
         
-        print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Size values - min: {parsed_min_val}, max: {parsed_max_val}")
+        logger.debug("Size values - min: %s, max: %s", parsed_min_val, parsed_max_val)
         
-        if parsed_min_val is not None or parsed_max_val is not None:
-            if parsed_min_val and parsed_max_val:
-                size_min, size_max = int(parsed_min_val), int(parsed_max_val)
-                if size_min == size_max:
-                    single_size = size_min
-                    deviation = 0.20
-                    state.size_min, state.size_max = int(single_size * (1 - deviation)), int(single_size * (1 + deviation))
-                    print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Created flexible size range: {state.size_min} - {state.size_max} sqft")
-                else:
-                    state.size_min, state.size_max = size_min, size_max
-                    print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Updated size range: {state.size_min} - {state.size_max} sqft")
-            elif parsed_min_val:
-                state.size_min, state.size_max = int(parsed_min_val), None
-                print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Updated minimum size: {state.size_min} sqft")
-            elif parsed_max_val:
-                state.size_min, state.size_max = None, int(parsed_max_val)
-                print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Updated maximum size: {state.size_max} sqft")
+        size_min = int(parsed_min_val) if parsed_min_val else None
+        size_max = int(parsed_max_val) if parsed_max_val else None
+        if size_min is not None or size_max is not None:
+            # A single target size (min == max) becomes a flexible range around it
+            state.size_min, state.size_max = _size_range(size_min) if size_min == size_max else (size_min, size_max)
+            logger.debug("Updated size: %s - %s sqft", state.size_min, state.size_max)
         
         # Handle "all warehouses" phrases
-        user_message_lower = user_message.lower()
-        all_warehouse_phrases = ["all warehouses", "show all", "any size", "all available"]
-        if any(phrase in user_message_lower for phrase in all_warehouse_phrases):
+        if ALL_WAREHOUSES_RE.search(user_message_lower):
             state.size_min, state.size_max = None, None
-            print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Cleared size restrictions")
+            logger.debug("Cleared size restrictions")
             
     except Exception as e:
-        print(f"{Fore.RED}[ERROR]{Style.RESET_ALL} Failed to parse area/size: {e}")
+        logger.error("Failed to parse area/size: %s", e)
 
-async def _parse_business_nature(state: GraphState, user_message: str):
+async def _parse_business_nature(state: GraphState, user_message: str, user_message_lower: str):
     """Parse land type preference from user message."""
-    user_message_lower = user_message.lower()
     
     # Parse land type preference
-    if any(word in user_message_lower for word in ["industrial", "yes", "manufacturing", "processing"]):
+    if INDUSTRIAL_REPLY_RE.search(user_message_lower):
         state.land_type_industrial = True
-        print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Land type: Industrial")
-    elif any(word in user_message_lower for word in ["commercial", "no", "distribution", "storage"]):
+        logger.debug("Land type: Industrial")
+    elif COMMERCIAL_REPLY_RE.search(user_message_lower):
         state.land_type_industrial = False
-        print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Land type: Commercial")
+        logger.debug("Land type: Commercial")
     else:
         # Default to commercial for flexibility
         state.land_type_industrial = False
-        print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Land type: Commercial (default)")
+        logger.debug("Land type: Commercial (default)")
+
+SEARCH_LOCATION_EXTRACTION_SYSTEM_PROMPT = """Extract location from user message.
+Extract city/location name after words like 'in', 'warehouses in', etc."""
 
-async def _parse_specific_requirements(state: GraphState, user_message: str):
+SEARCH_LOCATION_EXTRACTION_CHAIN = _LazyChain(lambda: ChatPromptTemplate.from_messages([
+    SystemMessage(content=SEARCH_LOCATION_EXTRACTION_SYSTEM_PROMPT),
+    ("user", "Extract location: {message}")
+]) | _get_extraction_llm())
+
+BUDGET_EXTRACTION_SYSTEM_PROMPT = """Extract budget requirements from user message.
+
+Instructions:
+1. Handle ranges: "₹20-50 per sqft", "between ₹30 and ₹60", "20 to 30", "budget 15-25"
+2. Handle max only: "up to ₹40", "maximum ₹35", "not more than 50", "under ₹30"
+3. Handle min only: "at least ₹25", "minimum ₹20", "above ₹15", "starting from 30"
+4. Handle single numbers: "₹35 per sqft", "budget 50", "rate 40" → treat as budget_max
+5. Extract only numbers, remove currency symbols and units
+6. Handle "k" notation: "25k" = 25000, but for rent usually means 25 per sqft
+7. Clear budget: "any budget", "flexible budget", "no budget limit", "open budget"
+8. Complex patterns: "make budget 20 to 30", "set rate between 15-25", "price range 30-45"
+
+Examples:
+- "budget ₹20-50 per sqft" → {"budget_min": 20, "budget_max": 50}
+- "up to ₹40 rent" → {"budget_min": null, "budget_max": 40}
+- "at least ₹25 per sqft" → {"budget_min": 25, "budget_max": null}
+- "₹35 per sqft" → {"budget_min": null, "budget_max": 35}
+- "flexible budget" → {"budget_min": null, "budget_max": null}"""
+
+BUDGET_EXTRACTION_CHAIN = _LazyChain(lambda: ChatPromptTemplate.from_messages([
+    SystemMessage(content=BUDGET_EXTRACTION_SYSTEM_PROMPT),
+    ("user", "Extract budget: {message}")
+]) | _get_extraction_llm())
+
+async def _parse_specific_requirements(state: GraphState, user_message: str, user_message_lower: str):
     """Parse specific requirements like fire NOC, budget, etc."""
-    user_message_lower = user_message.lower()
     
-    print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Parsing specific requirements from: '{user_message}'")
-    print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Budget before parsing - min: {state.budget_min}, max: {state.budget_max}")
+    logger.debug("Parsing specific requirements from: '%s'", user_message)
+    logger.debug("Budget before parsing - min: %s, max: %s", state.budget_min, state.budget_max)
     
     # Handle "none" or similar responses first
-    if user_message_lower in ["none", "no", "nothing", "no requirements", "that's all"]:
-        print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} User indicated no specific requirements")
+    reply = user_message_lower.strip(" .!")
+    if reply in NO_REQUIREMENTS_REPLIES:
+        logger.debug("User indicated no specific requirements")
         return
     
     # Handle simple confirmations that should NOT trigger requirement parsing
-    simple_confirmations = ["yes", "yep", "sure", "correct", "ok", "okay"]
-    if user_message_lower in simple_confirmations:
-        print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Simple confirmation detected, skipping requirement parsing")
+    if reply in SIMPLE_CONFIRMATIONS:
+        logger.debug("Simple confirmation detected, skipping requirement parsing")
         return
-    location_keywords = ["warehouses in", "similar in", "show in", "find in", "search in"]
-    if (state.location_query and  # Only if we already have a location
-        any(keyword in user_message_lower for keyword in location_keywords)):
+    
+    if state.location_query and SEARCH_ELSEWHERE_RE.search(user_message_lower):  # Only if we already have a location
         # User wants to search in a different location - parse it
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", """Extract location from user message. Return ONLY JSON:
-            {{"location_query": null}}
-            Extract city/location name after words like 'in', 'warehouses in', etc."""),
-            ("user", "Extract location: {message}")
-        ])
-        
         try:
-            chain = prompt | llm
-            response = await chain.ainvoke({"message": user_message})
-            content = response.content.strip()
-            json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', content, re.DOTALL)
-            json_str = json_match.group(1) if json_match else content
-            parsed_data = json.loads(json_str)
+            parsed_data = await _extract_requirements(SEARCH_LOCATION_EXTRACTION_CHAIN, user_message)
             
             if parsed_data.get("location_query"):
                 # Reset search parameters for new location
@@ -519,61 +844,32 @@ async def _parse_specific_requirements(state: GraphState, user_message: str):
                 state.parsed_cities = None
                 state.parsed_state = None
                 state.current_page = 1
+                state.search_cursor = None
                 state.search_results = None
                 state.requirements_confirmed = False
-                print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} New location search: {state.location_query}")
+                logger.debug("New location search: %s", state.location_query)
                 return
         except Exception as e:
-            print(f"{Fore.RED}[ERROR]{Style.RESET_ALL} Failed to parse location: {e}")
-    
-    # Handle "none" or similar responses
-    if user_message_lower in ["none", "no", "nothing", "no requirements", "that's all"]:
-        print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} User indicated no specific requirements")
-        return
+            logger.error("Failed to parse location: %s", e)
+    
+    # Budget, specification and size extraction are independent LLM calls. Start the ones this
+    # message needs together; the parsing below then awaits them in order without serializing them.
+    # (They start only now because a location switch above returns without using them.)
+    needs_budget = _mentions_budget(user_message_lower)
+    if needs_budget and _fast_extract_budget(user_message) is None:
+        _extraction_task(BUDGET_EXTRACTION_CHAIN, user_message)
+    if SPEC_KEYWORDS_RE.search(user_message_lower):
+        _extraction_task(SPECIFICATIONS_EXTRACTION_CHAIN, user_message)
+    if SIZE_KEYWORDS_RE.search(user_message_lower):
+        _extraction_task(SIZE_EXTRACTION_CHAIN, user_message)
     
     # Enhanced budget parsing (only if user is explicitly mentioning budget/price/rate)
-    budget_keywords = ["budget", "price", "rate", "cost", "₹", "rupees", "per sqft", "/sqft", 
-                       "rent", "rental", "lease rate", "monthly rent", "pricing", "charges",
-                       "expense", "fees", "payment", "amount", "money", "financial", "affordable"]
-    vague_budget_phrases = ["as per market", "market rate", "depends", "flexible", "negotiate",
-                           "reasonable", "fair price", "market price", "standard rate", 
-                           "competitive", "discuss", "talk about price", "let's see", "open to negotiate"]
-    
-    # Only try to extract budget if user is actually talking about budget AND not using vague phrases
-    if (any(keyword in user_message_lower for keyword in budget_keywords) and 
-        not any(phrase in user_message_lower for phrase in vague_budget_phrases)):
+    if needs_budget:
         
         try:
-            prompt = ChatPromptTemplate.from_messages([
-                ("system", """Extract budget requirements from user message. 
-                Return ONLY a raw JSON object:
-                {{"budget_min": null, "budget_max": null}}
-                
-                Instructions:
-                1. Handle ranges: "₹20-50 per sqft", "between ₹30 and ₹60", "20 to 30", "budget 15-25"
-                2. Handle max only: "up to ₹40", "maximum ₹35", "not more than 50", "under ₹30"
-                3. Handle min only: "at least ₹25", "minimum ₹20", "above ₹15", "starting from 30"
-                4. Handle single numbers: "₹35 per sqft", "budget 50", "rate 40" → treat as budget_max
-                5. Extract only numbers, remove currency symbols and units
-                6. Handle "k" notation: "25k" = 25000, but for rent usually means 25 per sqft
-                7. Clear budget: "any budget", "flexible budget", "no budget limit", "open budget"
-                8. Complex patterns: "make budget 20 to 30", "set rate between 15-25", "price range 30-45"
-                
-                Examples:
-                - "budget ₹20-50 per sqft" → {{"budget_min": 20, "budget_max": 50}}
-                - "up to ₹40 rent" → {{"budget_min": null, "budget_max": 40}}
-                - "at least ₹25 per sqft" → {{"budget_min": 25, "budget_max": null}}
-                - "₹35 per sqft" → {{"budget_min": null, "budget_max": 35}}
-                - "flexible budget" → {{"budget_min": null, "budget_max": null}}"""),
-                ("user", "Extract budget: {message}")
-            ])
-            
-            chain = prompt | llm
-            response = await chain.ainvoke({"message": user_message})
-            content = response.content.strip()
-            json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', content, re.DOTALL)
-            json_str = json_match.group(1) if json_match else content
-            parsed_data = json.loads(json_str)
+            parsed_data = _fast_extract_budget(user_message)
+            if parsed_data is None:
+                parsed_data = await _extract_requirements(BUDGET_EXTRACTION_CHAIN, user_message)
             
             parsed_min_budget = parsed_data.get("budget_min")
             parsed_max_budget = parsed_data.get("budget_max")
@@ -581,309 +877,163 @@ async def _parse_specific_requirements(state: GraphState, user_message: str):
             if parsed_min_budget is not None or parsed_max_budget is not None:
                 if parsed_min_budget and parsed_max_budget:
                     state.budget_min, state.budget_max = int(parsed_min_budget), int(parsed_max_budget)
-                    print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Updated budget range: ₹{state.budget_min} - ₹{state.budget_max}/sqft")
+                    logger.debug("Updated budget range: ₹%s - ₹%s/sqft", state.budget_min, state.budget_max)
                 elif parsed_min_budget:
                     state.budget_min = int(parsed_min_budget)
-                    print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Updated minimum budget: ₹{state.budget_min}/sqft")
+                    logger.debug("Updated minimum budget: ₹%s/sqft", state.budget_min)
                 elif parsed_max_budget:
                     state.budget_max = int(parsed_max_budget)
-                    print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Updated maximum budget: ₹{state.budget_max}/sqft")
+                    logger.debug("Updated maximum budget: ₹%s/sqft", state.budget_max)
             elif "any budget" in user_message_lower or "flexible" in user_message_lower:
                 state.budget_min, state.budget_max = None, None
-                print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Cleared budget restrictions")
+                logger.debug("Cleared budget restrictions")
         except Exception as e:
-            print(f"{Fore.RED}[ERROR]{Style.RESET_ALL} Failed to parse budget: {e}")
+            logger.error("Failed to parse budget: %s", e)
             # Fallback to regex extraction for simple patterns
             # Look for patterns like "50 to 60", "20-30", "budget 25 to 40"
-            range_match = re.search(r'(\d+)\s*(?:to|-)\s*(\d+)', user_message)
+            range_match = BUDGET_RANGE_RE.search(user_message)
             if range_match:
                 try:
                     min_val, max_val = int(range_match.group(1)), int(range_match.group(2))
                     state.budget_min, state.budget_max = min_val, max_val
-                    print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Updated budget range (fallback): ₹{state.budget_min} - ₹{state.budget_max}/sqft")
+                    logger.debug("Updated budget range (fallback): ₹%s - ₹%s/sqft", state.budget_min, state.budget_max)
                 except ValueError:
                     pass
             else:
                 # Single number fallback
-                budget_match = re.search(r'₹?(\d+(?:,\d{3})*(?:\.\d+)?)', user_message)
+                budget_match = BUDGET_VALUE_RE.search(user_message)
                 if budget_match:
                     try:
                         budget_value = int(budget_match.group(1).replace(',', ''))
                         state.budget_max = budget_value
-                        print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Updated budget (fallback): ₹{state.budget_max}/sqft")
+                        logger.debug("Updated budget (fallback): ₹%s/sqft", state.budget_max)
                     except ValueError:
                         pass
     
     # Parse other warehouse requirements using LLM
-    await _parse_warehouse_specifications(state, user_message)
+    await _parse_warehouse_specifications(state, user_message, user_message_lower)
     
     # Legacy keyword-based parsing (keeping as fallback)
-    await _parse_legacy_requirements(state, user_message)
+    await _parse_legacy_requirements(state, user_message, user_message_lower)
+
+SPECIFICATIONS_EXTRACTION_SYSTEM_PROMPT = """Extract warehouse specifications from user message.
 
-async def _parse_warehouse_specifications(state: GraphState, user_message: str):
+Instructions:
+1. warehouse_type: Extract "PEB", "RCC", or null for any/flexible
+   - PEB: pre-engineered, steel structure, metal building
+   - RCC: concrete, cement, reinforced concrete, brick
+   - null: any, both, either, flexible, doesn't matter
+
+2. min_docks: Extract minimum number of loading docks (integer)
+   - Handle: "5 docks", "at least 3 loading bays", "minimum 2 platforms"
+   - 0 for: "no dock", "without dock", "zero dock"
+
+3. min_clear_height: Extract minimum clear height in feet (convert meters to feet if needed)
+   - Handle: "20 feet", "6 meters", "minimum 15 ft height"
+   - Convert: 1 meter = 3.28 feet
+
+4. compliances_query: Extract compliance requirements (NOT fire-related)
+   - Examples: "environmental", "safety", "OSHA", "pollution control"
+
+5. fire_noc_required: true if fire NOC/compliance mentioned, false if explicitly not wanted
+   - true: "fire NOC", "fire compliance", "make it have fire NOC", "fire safety required"
+   - false: "no fire NOC", "without fire compliance", "skip fire requirements"
+
+6. availability: Extract availability needs
+   - Examples: "immediate", "within 30 days", "ASAP", "urgent", "next month"
+
+7. zone: Extract zone preferences
+   - Examples: "industrial zone", "SEZ", "special economic zone", "IT park"
+
+8. is_broker: true if user wants broker properties, false if owner properties
+   - true: "broker properties", "through agent", "via broker"
+   - false: "owner properties", "direct owner", "no broker", "without agent"
+
+Examples:
+- "PEB structure with 5 docks and 20 feet height" → {"warehouse_type": "PEB", "min_docks": 5, "min_clear_height": 20}
+- "fire NOC required, immediate availability" → {"fire_noc_required": true, "availability": "immediate"}
+- "concrete building, no fire compliance needed" → {"warehouse_type": "RCC", "fire_noc_required": false}
+- "make it have fire NOC, 3 loading bays" → {"fire_noc_required": true, "min_docks": 3}
+- "owner properties only, industrial zone" → {"is_broker": false, "zone": "industrial zone"}"""
+
+SPECIFICATIONS_EXTRACTION_CHAIN = _LazyChain(lambda: ChatPromptTemplate.from_messages([
+    SystemMessage(content=SPECIFICATIONS_EXTRACTION_SYSTEM_PROMPT),
+    ("user", "Extract specifications: {message}")
+]) | _get_extraction_llm())
+
+async def _parse_warehouse_specifications(state: GraphState, user_message: str, user_message_lower: str):
     """Parse warehouse specifications like docks, height, type using LLM."""
-    user_message_lower = user_message.lower()
     
     # Check if message contains specification keywords
-    spec_keywords = ["dock", "height", "warehouse type", "structure", "peb", "rcc", "compliance", 
-                     "availability", "zone", "broker", "loading", "clear height", "ceiling"]
-    
-    if not any(keyword in user_message_lower for keyword in spec_keywords):
+    if not SPEC_KEYWORDS_RE.search(user_message_lower):
         return
     
     try:
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", """Extract warehouse specifications from user message. 
-            Return ONLY a raw JSON object:
-            {{
-                "warehouse_type": null,
-                "min_docks": null,
-                "min_clear_height": null,
-                "compliances_query": null,
-                "fire_noc_required": null,
-                "availability": null,
-                "zone": null,
-                "is_broker": null
-            }}
-            
-            Instructions:
-            1. warehouse_type: Extract "PEB", "RCC", or null for any/flexible
-               - PEB: pre-engineered, steel structure, metal building
-               - RCC: concrete, cement, reinforced concrete, brick
-               - null: any, both, either, flexible, doesn't matter
-            
-            2. min_docks: Extract minimum number of loading docks (integer)
-               - Handle: "5 docks", "at least 3 loading bays", "minimum 2 platforms"
-               - 0 for: "no dock", "without dock", "zero dock"
-            
-            3. min_clear_height: Extract minimum clear height in feet (convert meters to feet if needed)
-               - Handle: "20 feet", "6 meters", "minimum 15 ft height"
-               - Convert: 1 meter = 3.28 feet
-            
-            4. compliances_query: Extract compliance requirements (NOT fire-related)
-               - Examples: "environmental", "safety", "OSHA", "pollution control"
-            
-            5. fire_noc_required: true if fire NOC/compliance mentioned, false if explicitly not wanted
-               - true: "fire NOC", "fire compliance", "make it have fire NOC", "fire safety required"
-               - false: "no fire NOC", "without fire compliance", "skip fire requirements"
-            
-            6. availability: Extract availability needs
-               - Examples: "immediate", "within 30 days", "ASAP", "urgent", "next month"
-            
-            7. zone: Extract zone preferences  
-               - Examples: "industrial zone", "SEZ", "special economic zone", "IT park"
-            
-            8. is_broker: true if user wants broker properties, false if owner properties
-               - true: "broker properties", "through agent", "via broker"
-               - false: "owner properties", "direct owner", "no broker", "without agent"
-            
-            Examples:
-            - "PEB structure with 5 docks and 20 feet height" → {{"warehouse_type": "PEB", "min_docks": 5, "min_clear_height": 20}}
-            - "fire NOC required, immediate availability" → {{"fire_noc_required": true, "availability": "immediate"}}
-            - "concrete building, no fire compliance needed" → {{"warehouse_type": "RCC", "fire_noc_required": false}}
-            - "make it have fire NOC, 3 loading bays" → {{"fire_noc_required": true, "min_docks": 3}}
-            - "owner properties only, industrial zone" → {{"is_broker": false, "zone": "industrial zone"}}"""),
-            ("user", "Extract specifications: {message}")
-        ])
+        parsed_data = await _extract_requirements(SPECIFICATIONS_EXTRACTION_CHAIN, user_message)
         
-        chain = prompt | llm
-        response = await chain.ainvoke({"message": user_message})
-        content = response.content.strip()
-        json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', content, re.DOTALL)
-        json_str = json_match.group(1) if json_match else content
-        parsed_data = json.loads(json_str)
-        
-        print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Parsed specifications: {parsed_data}")
+        logger.debug("Parsed specifications: %s", parsed_data)
         
         # Update state with parsed values
         if parsed_data.get("warehouse_type"):
             state.warehouse_type = parsed_data["warehouse_type"]
-            print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Updated warehouse type: {state.warehouse_type}")
+            logger.debug("Updated warehouse type: %s", state.warehouse_type)
         
         if parsed_data.get("min_docks") is not None:
             state.min_docks = int(parsed_data["min_docks"])
-            print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Updated minimum docks: {state.min_docks}")
+            logger.debug("Updated minimum docks: %s", state.min_docks)
         
         if parsed_data.get("min_clear_height") is not None:
             state.min_clear_height = int(parsed_data["min_clear_height"])
-            print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Updated minimum clear height: {state.min_clear_height} ft")
+            logger.debug("Updated minimum clear height: %s ft", state.min_clear_height)
         
         if parsed_data.get("compliances_query"):
             state.compliances_query = parsed_data["compliances_query"]
-            print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Updated compliances: {state.compliances_query}")
+            logger.debug("Updated compliances: %s", state.compliances_query)
             # If fire compliance is mentioned, set the fire NOC flag
             if "fire" in state.compliances_query.lower():
                 state.fire_noc_required = True
-                print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Fire NOC required: True (from compliance)")
+                logger.debug("Fire NOC required: True (from compliance)")
         
         if parsed_data.get("fire_noc_required") is not None:
             state.fire_noc_required = parsed_data["fire_noc_required"]
-            print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Fire NOC required: {state.fire_noc_required} (from direct parsing)")
+            logger.debug("Fire NOC required: %s (from direct parsing)", state.fire_noc_required)
         
         if parsed_data.get("availability"):
             state.availability = parsed_data["availability"]
-            print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Updated availability: {state.availability}")
+            logger.debug("Updated availability: %s", state.availability)
         
         if parsed_data.get("zone"):
             state.zone = parsed_data["zone"]
-            print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Updated zone: {state.zone}")
+            logger.debug("Updated zone: %s", state.zone)
         
         if parsed_data.get("is_broker") is not None:
             state.is_broker = parsed_data["is_broker"]
-            print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Updated broker preference: {state.is_broker}")
+            logger.debug("Updated broker preference: %s", state.is_broker)
             
     except Exception as e:
-        print(f"{Fore.RED}[ERROR]{Style.RESET_ALL} Failed to parse specifications: {e}")
+        logger.error("Failed to parse specifications: %s", e)
 
-async def _parse_legacy_requirements(state: GraphState, user_message: str):
-    """Legacy keyword-based parsing for backward compatibility."""
-    user_message_lower = user_message.lower()
-    
-    # Check for size updates (when explicitly mentioned)
-    size_keywords = ["size", "sqft", "square feet", "area", "space"]
-    if any(keyword in user_message_lower for keyword in size_keywords):
-        # Parse size requirements using LLM for better accuracy
-        try:
-            prompt = ChatPromptTemplate.from_messages([
-                ("system", """Extract size requirements from user message. 
-                Return ONLY a raw JSON object:
-                {{"size_min": null, "size_max": null}}
-                
-                Instructions:
-                1. For size: handle ranges, "up to", "at least", single numbers
-                2. If user says "any size", set both fields to null
-                3. Convert all sizes to square feet"""),
-                ("user", "Extract size: {message}")
-            ])
-            
-            chain = prompt | llm
-            response = await chain.ainvoke({"message": user_message})
-            content = response.content.strip()
-            json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', content, re.DOTALL)
-            json_str = json_match.group(1) if json_match else content
-            parsed_data = json.loads(json_str)
-            
-            parsed_min_val = parsed_data.get("size_min")
-            parsed_max_val = parsed_data.get("size_max")
-            
-            if parsed_min_val is not None or parsed_max_val is not None:
-                if parsed_min_val and parsed_max_val:
-                    # Check if it's actually a single value (min == max)
-                    if parsed_min_val == parsed_max_val:
-                        # Single value - create ±10% range
-                        single_value = int(parsed_min_val)
-                        range_deviation = 0.10  # 10%
-                        state.size_min = int(single_value * (1 - range_deviation))
-                        state.size_max = int(single_value * (1 + range_deviation))
-                        print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Single value {single_value} sqft converted to range: {state.size_min} - {state.size_max} sqft (±10%)")
-                    else:
-                        # Actual range provided
-                        state.size_min, state.size_max = int(parsed_min_val), int(parsed_max_val)
-                        print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Updated size range: {state.size_min} - {state.size_max} sqft")
-                elif parsed_min_val:
-                    # Only minimum provided - could be single value or minimum
-                    single_value = int(parsed_min_val)
-                    # Check if user said "at least" or similar, otherwise treat as single value
-                    if any(phrase in user_message_lower for phrase in ["at least", "minimum", "min", "above", "more than"]):
-                        state.size_min = single_value
-                        print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Updated minimum size: {state.size_min} sqft")
-                    else:
-                        # Treat as single value - create ±10% range
-                        range_deviation = 0.10  # 10%
-                        state.size_min = int(single_value * (1 - range_deviation))
-                        state.size_max = int(single_value * (1 + range_deviation))
-                        print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Single value {single_value} sqft converted to range: {state.size_min} - {state.size_max} sqft (±10%)")
-                elif parsed_max_val:
-                    # Only maximum provided - could be single value or maximum
-                    single_value = int(parsed_max_val)
-                    # Check if user said "up to" or similar, otherwise treat as single value
-                    if any(phrase in user_message_lower for phrase in ["up to", "maximum", "max", "below", "less than", "under"]):
-                        state.size_max = single_value
-                        print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Updated maximum size: {state.size_max} sqft")
-                    else:
-                        # Treat as single value - create ±10% range
-                        range_deviation = 0.10  # 10%
-                        state.size_min = int(single_value * (1 - range_deviation))
-                        state.size_max = int(single_value * (1 + range_deviation))
-                        print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Single value {single_value} sqft converted to range: {state.size_min} - {state.size_max} sqft (±10%)")
-            elif "any size" in user_message_lower or "all sizes" in user_message_lower:
-                state.size_min, state.size_max = None, None
-                print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Cleared size restrictions")
-        except Exception as e:
-            print(f"{Fore.RED}[ERROR]{Style.RESET_ALL} Failed to parse size update: {e}")
-    
-    # Check for location updates (when explicitly mentioned)
-    location_keywords = ["location", "city", "place", "area", "region", "move to", "change location", 
-                        "make city", "change city", "switch to", "find in", "search in", "show in",
-                        "warehouses in", "change to", "update location", "new location"]
-    if any(keyword in user_message_lower for keyword in location_keywords):
-        try:
-            prompt = ChatPromptTemplate.from_messages([
-                ("system", """Extract location from user message. Return ONLY JSON:
-                {{"location_query": null}}
-                Extract city/location name from the message. Look for city names after words like 'city', 'in', 'to', etc."""),
-                ("user", "Extract location: {message}")
-            ])
-            
-            chain = prompt | llm
-            response = await chain.ainvoke({"message": user_message})
-            content = response.content.strip()
-            json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', content, re.DOTALL)
-            json_str = json_match.group(1) if json_match else content
-            parsed_data = json.loads(json_str)
-            
-            if parsed_data.get("location_query"):
-                state.location_query = parsed_data["location_query"]
-                state.parsed_cities = None
-                state.parsed_state = None
-                state.current_page = 1
-                state.search_results = None
-                state.requirements_confirmed = False
-                print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Updated location: {state.location_query}")
-        except Exception as e:
-            print(f"{Fore.RED}[ERROR]{Style.RESET_ALL} Failed to parse location update: {e}")
-    
-    # Check for land type changes
-    land_type_keywords = ["land type", "industrial", "commercial", "land classification"]
-    if any(keyword in user_message_lower for keyword in land_type_keywords):
-        if any(word in user_message_lower for word in ["industrial", "manufacturing", "processing"]):
-            state.land_type_industrial = True
-            print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Updated land type: Industrial")
-        elif any(word in user_message_lower for word in ["commercial", "distribution", "storage"]):
-            state.land_type_industrial = False
-            print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Updated land type: Commercial")
-        elif any(word in user_message_lower for word in ["any", "both", "either"]):
-            state.land_type_industrial = None
-            print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Updated land type: Any")
-    
-async def _parse_legacy_requirements(state: GraphState, user_message: str):
+SIZE_EXTRACTION_SYSTEM_PROMPT = """Extract size requirements from user message.
+
+Instructions:
+1. For size: handle ranges, "up to", "at least", single numbers
+2. If user says "any size", set both fields to null
+3. Convert all sizes to square feet
+4. Handle "k" notation: "10k" = 10000"""
+
+SIZE_EXTRACTION_CHAIN = _LazyChain(lambda: ChatPromptTemplate.from_messages([
+    SystemMessage(content=SIZE_EXTRACTION_SYSTEM_PROMPT),
+    ("user", "Extract size: {message}")
+]) | _get_extraction_llm())
+
+async def _parse_legacy_requirements(state: GraphState, user_message: str, user_message_lower: str):
     """Legacy keyword-based parsing for backward compatibility - only when LLM parsing misses things."""
-    user_message_lower = user_message.lower()
     
     # Check for size updates (when explicitly mentioned)
-    size_keywords = ["size", "sqft", "square feet", "area", "space"]
-    if any(keyword in user_message_lower for keyword in size_keywords):
+    if SIZE_KEYWORDS_RE.search(user_message_lower):
         # Parse size requirements using LLM for better accuracy
         try:
-            prompt = ChatPromptTemplate.from_messages([
-                ("system", """Extract size requirements from user message. 
-                Return ONLY a raw JSON object:
-                {{"size_min": null, "size_max": null}}
-                
-                Instructions:
-                1. For size: handle ranges, "up to", "at least", single numbers
-                2. If user says "any size", set both fields to null
-                3. Convert all sizes to square feet
-                4. Handle "k" notation: "10k" = 10000"""),
-                ("user", "Extract size: {message}")
-            ])
-            
-            chain = prompt | llm
-            response = await chain.ainvoke({"message": user_message})
-            content = response.content.strip()
-            json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', content, re.DOTALL)
-            json_str = json_match.group(1) if json_match else content
-            parsed_data = json.loads(json_str)
+            parsed_data = await _extract_requirements(SIZE_EXTRACTION_CHAIN, user_message)
             
             parsed_min_val = parsed_data.get("size_min")
             parsed_max_val = parsed_data.get("size_max")
@@ -894,223 +1044,253 @@ async def _parse_legacy_requirements(state: GraphState, user_message: str):
                     if parsed_min_val == parsed_max_val:
                         # Single value - create ±20% range
                         single_value = int(parsed_min_val)
-                        range_deviation = 0.20  # 20%
-                        state.size_min = int(single_value * (1 - range_deviation))
-                        state.size_max = int(single_value * (1 + range_deviation))
-                        print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Single value {single_value} sqft converted to range: {state.size_min} - {state.size_max} sqft (±20%)")
+                        state.size_min, state.size_max = _size_range(single_value)
+                        logger.debug("Single value %s sqft converted to range: %s - %s sqft (±20%%)", single_value, state.size_min, state.size_max)
                     else:
                         # Actual range provided
                         state.size_min, state.size_max = int(parsed_min_val), int(parsed_max_val)
-                        print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Updated size range: {state.size_min} - {state.size_max} sqft")
+                        logger.debug("Updated size range: %s - %s sqft", state.size_min, state.size_max)
                 elif parsed_min_val:
                     # Only minimum provided - could be single value or minimum
                     single_value = int(parsed_min_val)
                     # Check if user said "at least" or similar, otherwise treat as single value
-                    if any(phrase in user_message_lower for phrase in ["at least", "minimum", "min", "above", "more than"]):
+                    if MIN_QUALIFIER_RE.search(user_message_lower):
                         state.size_min = single_value
-                        print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Updated minimum size: {state.size_min} sqft")
+                        logger.debug("Updated minimum size: %s sqft", state.size_min)
                     else:
                         # Treat as single value - create ±20% range
-                        range_deviation = 0.20  # 20%
-                        state.size_min = int(single_value * (1 - range_deviation))
-                        state.size_max = int(single_value * (1 + range_deviation))
-                        print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Single value {single_value} sqft converted to range: {state.size_min} - {state.size_max} sqft (±20%)")
+                        state.size_min, state.size_max = _size_range(single_value)
+                        logger.debug("Single value %s sqft converted to range: %s - %s sqft (±20%%)", single_value, state.size_min, state.size_max)
                 elif parsed_max_val:
                     # Only maximum provided - could be single value or maximum
                     single_value = int(parsed_max_val)
                     # Check if user said "up to" or similar, otherwise treat as single value
-                    if any(phrase in user_message_lower for phrase in ["up to", "maximum", "max", "below", "less than", "under"]):
+                    if MAX_QUALIFIER_RE.search(user_message_lower):
                         state.size_max = single_value
-                        print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Updated maximum size: {state.size_max} sqft")
+                        logger.debug("Updated maximum size: %s sqft", state.size_max)
                     else:
                         # Treat as single value - create ±20% range
-                        range_deviation = 0.20  # 20%
-                        state.size_min = int(single_value * (1 - range_deviation))
-                        state.size_max = int(single_value * (1 + range_deviation))
-                        print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Single value {single_value} sqft converted to range: {state.size_min} - {state.size_max} sqft (±20%)")
+                        state.size_min, state.size_max = _size_range(single_value)
+                        logger.debug("Single value %s sqft converted to range: %s - %s sqft (±20%%)", single_value, state.size_min, state.size_max)
             elif "any size" in user_message_lower or "flexible" in user_message_lower:
                 state.size_min, state.size_max = None, None
-                print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Cleared size restrictions")
+                logger.debug("Cleared size restrictions")
         except Exception as e:
-            print(f"{Fore.RED}[ERROR]{Style.RESET_ALL} Failed to parse size: {e}")
+            logger.error("Failed to parse size: %s", e)
     
     # Enhanced Fire NOC parsing (only if not already set by LLM)
     if state.fire_noc_required is None:  # Only if LLM didn't set it
-        fire_keywords = ["fire noc", "fire clearance", "fire compliance", "fire certificate", "noc", 
-                         "fire safety", "fire approval", "fire permit", "fire license"]
-        if any(keyword in user_message_lower for keyword in fire_keywords):
-            positive_indicators = ["yes", "required", "need", "must have", "want", "should have", 
-                                  "make it have", "add", "include", "with", "ensure", "necessary",
-                                  "mandatory", "compulsory", "essential", "needed", "requires", 
-                                  "please add", "make sure", "prefer", "looking for", "seeking"]
-            negative_indicators = ["no", "not required", "don't need", "optional", "without", 
-                                  "remove", "exclude", "don't want", "skip", "ignore", "avoid",
-                                  "not necessary", "no need", "not interested", "doesn't matter"]
-            
-            if any(word in user_message_lower for word in positive_indicators):
+        if FIRE_NOC_RE.search(user_message_lower):
+            if FIRE_NOC_WANTED_RE.search(user_message_lower):
                 state.fire_noc_required = True
-                print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Fire NOC required: True (legacy fallback)")
-            elif any(word in user_message_lower for word in negative_indicators):
+                logger.debug("Fire NOC required: True (legacy fallback)")
+            elif FIRE_NOC_UNWANTED_RE.search(user_message_lower):
                 state.fire_noc_required = False
-                print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Fire NOC required: False (legacy fallback)")
+                logger.debug("Fire NOC required: False (legacy fallback)")
     
     # Enhanced Warehouse type parsing (only if not already set by LLM)
     if state.warehouse_type is None:  # Only if LLM didn't set it
-        warehouse_type_keywords = ["warehouse type", "structure", "construction", "peb", "rcc", "shed type",
-                                   "building type", "structure type", "construction type", "material"]
-        if any(keyword in user_message_lower for keyword in warehouse_type_keywords):
-            peb_indicators = ["peb", "pre-engineered", "pre engineered", "steel structure", "metal building"]
-            rcc_indicators = ["rcc", "concrete", "cement", "reinforced concrete", "brick", "solid construction"]
-            flexible_indicators = ["any", "both", "either", "flexible", "doesn't matter", "open to both", 
-                                  "not particular", "whatever", "any type", "no preference"]
-            
-            if any(word in user_message_lower for word in peb_indicators):
+        if WAREHOUSE_TYPE_RE.search(user_message_lower):
+            if PEB_RE.search(user_message_lower):
                 state.warehouse_type = "PEB"
-                print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Updated warehouse type: PEB (legacy fallback)")
-            elif any(word in user_message_lower for word in rcc_indicators):
+                logger.debug("Updated warehouse type: PEB (legacy fallback)")
+            elif RCC_RE.search(user_message_lower):
                 state.warehouse_type = "RCC"
-                print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Updated warehouse type: RCC (legacy fallback)")
-            elif any(word in user_message_lower for word in flexible_indicators):
+                logger.debug("Updated warehouse type: RCC (legacy fallback)")
+            elif NO_PREFERENCE_RE.search(user_message_lower):
                 state.warehouse_type = None
-                print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Updated warehouse type: Any (legacy fallback)")
+                logger.debug("Updated warehouse type: Any (legacy fallback)")
     
     # Enhanced Loading docks parsing (only if not already set by LLM)
     if state.min_docks is None:  # Only if LLM didn't set it
-        dock_keywords = ["dock", "loading dock", "loading bay", "loading platform", "docks", "loading bays",
-                         "truck dock", "vehicle loading", "loading area", "loading zone", "bay", "platform"]
-        if any(keyword in user_message_lower for keyword in dock_keywords):
-            dock_match = re.search(r'(\d+)\s*(?:dock|loading|bay|platform)', user_message_lower)
+        if DOCKS_RE.search(user_message_lower):
+            dock_match = DOCK_COUNT_RE.search(user_message_lower)
             if dock_match:
                 state.min_docks = int(dock_match.group(1))
-                print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Updated minimum docks: {state.min_docks} (legacy fallback)")
+                logger.debug("Updated minimum docks: %s (legacy fallback)", state.min_docks)
             else:
                 # Enhanced negative indicators for docks
-                no_dock_indicators = ["no dock", "without dock", "zero dock", "0 dock", "no loading dock",
-                                     "no bays", "without loading", "no platform", "don't need dock",
-                                     "no loading bay", "skip dock", "avoid dock"]
-                if any(phrase in user_message_lower for phrase in no_dock_indicators):
+                if NO_DOCKS_RE.search(user_message_lower):
                     state.min_docks = 0
-                    print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Updated minimum docks: 0 (legacy fallback)")
+                    logger.debug("Updated minimum docks: 0 (legacy fallback)")
     
     # Enhanced Clear height parsing (only if not already set by LLM)
     if state.min_clear_height is None:  # Only if LLM didn't set it
-        height_keywords = ["height", "clear height", "ceiling height", "clearance", "headroom", 
-                           "vertical clearance", "roof height", "minimum height", "overhead clearance"]
-        if any(keyword in user_message_lower for keyword in height_keywords):
+        if CLEAR_HEIGHT_RE.search(user_message_lower):
             # Enhanced regex to catch more patterns
-            height_match = re.search(r'(\d+(?:\.\d+)?)\s*(?:ft|feet|foot|meter|metres|meters|m)\b', user_message_lower)
+            height_match = CLEAR_HEIGHT_VALUE_RE.search(user_message_lower)
             if height_match:
                 height_value = float(height_match.group(1))
                 # Convert meters to feet if needed
                 if 'm' in user_message_lower or 'meter' in user_message_lower:
                     height_value = height_value * 3.28084  # Convert meters to feet
                 state.min_clear_height = int(height_value)
-                print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Updated minimum clear height: {state.min_clear_height} ft (legacy fallback)")
+                logger.debug("Updated minimum clear height: %s ft (legacy fallback)", state.min_clear_height)
     
     # Enhanced Land type parsing (only if not already set by LLM or previous logic)
     if state.land_type_industrial is None:  # Only if not already set
-        land_type_keywords = ["land type", "land classification", "zoning", "industrial land", "commercial land",
-                              "industrial zone", "commercial zone", "land use", "property type"]
-        if any(keyword in user_message_lower for keyword in land_type_keywords):
-            industrial_indicators = ["industrial", "manufacturing", "production", "factory", "industry",
-                                    "industrial zone", "industrial area", "manufacturing zone"]
-            commercial_indicators = ["commercial", "distribution", "storage", "warehouse", "logistics",
-                                    "commercial zone", "distribution center", "storage facility"]
-            flexible_indicators = ["any", "both", "either", "flexible", "doesn't matter", "open to both",
-                                  "not particular", "whatever", "any type", "no preference"]
-            
-            if any(word in user_message_lower for word in industrial_indicators):
+        if LAND_TYPE_RE.search(user_message_lower):
+            if INDUSTRIAL_RE.search(user_message_lower):
                 state.land_type_industrial = True
-                print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Updated land type: Industrial (legacy fallback)")
-            elif any(word in user_message_lower for word in commercial_indicators):
+                logger.debug("Updated land type: Industrial (legacy fallback)")
+            elif COMMERCIAL_RE.search(user_message_lower):
                 state.land_type_industrial = False
-                print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Updated land type: Commercial (legacy fallback)")
-            elif any(word in user_message_lower for word in flexible_indicators):
+                logger.debug("Updated land type: Commercial (legacy fallback)")
+            elif NO_PREFERENCE_RE.search(user_message_lower):
                 state.land_type_industrial = None
-                print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Updated land type: Any (legacy fallback)")
+                logger.debug("Updated land type: Any (legacy fallback)")
+
+# Location analyses keyed by normalized query, so "Mumbai", "mumbai " and "MUMBAI" share one entry.
+# Entries are tasks: a prefetch started at confirmation and the later lookup share the same call.
+# The graph state does not survive between API requests, so the cache lives at module scope.
+_location_cache: Dict[str, asyncio.Task] = {}
+MAX_LOCATION_CACHE = 256
+# Successful analyses are also persisted, so a restart (or another worker) doesn't re-ask the LLM.
+# Each is stored with the model and prompt version that produced it and expires after a while.
+LOCATION_CACHE_PATH = os.getenv("LOCATION_CACHE_PATH", ".location_cache.sqlite3")
+LOCATION_CACHE_TTL = 30 * 24 * 3600  # seconds
+_LOCATION_CACHE_VERSION = f"{LOCATION_MODEL}:{LOCATION_PROMPT_VERSION}"
+# One connection shared by whichever threads run an event loop; every use holds this lock
+_location_db_lock = threading.Lock()
+
+# Search tasks keyed by the exact search parameters (including page), kept for a short while.
+# Storing tasks lets a page prefetched while the user reads the previous one be picked up mid-flight.
+_search_cache: Dict[tuple, tuple] = {}  # key -> (started_at, task)
+MAX_SEARCH_CACHE = 256
+SEARCH_CACHE_TTL = 300  # seconds
+
+def _needs_location_analysis(state: GraphState) -> bool:
+    return bool(state.location_query and not state.parsed_cities and not state.parsed_state and not state.search_area)
+
+@functools.cache
+def _get_location_db():
+    db = sqlite3.connect(LOCATION_CACHE_PATH, check_same_thread=False)
+    # Superseded by location_analyses, whose rows record the version and age of each answer
+    db.execute("DROP TABLE IF EXISTS loc_cache")
+    db.execute("CREATE TABLE IF NOT EXISTS location_analyses "
+               "(q TEXT PRIMARY KEY, version TEXT NOT NULL, stored_at REAL NOT NULL, result TEXT NOT NULL)")
+    return db
+
+def _stored_location(key: str) -> Optional[dict]:
+    """The persisted analysis for this query, unless it is expired or from another model or prompt."""
+    with _location_db_lock:
+        row = _get_location_db().execute(
+            "SELECT result FROM location_analyses WHERE q = ? AND version = ? AND stored_at > ?",
+            (key, _LOCATION_CACHE_VERSION, time.time() - LOCATION_CACHE_TTL),
+        ).fetchone()
+    return json.loads(row[0]) if row else None
+
+def _store_location(key: str, task: asyncio.Task):
+    """Done-callback persisting a successful analysis; failures are left to be retried."""
+    if task.cancelled() or task.exception() is not None or not isinstance(task.result(), dict):
+        return
+    with _location_db_lock:
+        db = _get_location_db()
+        db.execute(
+            "INSERT OR REPLACE INTO location_analyses (q, version, stored_at, result) VALUES (?, ?, ?, ?)",
+            (key, _LOCATION_CACHE_VERSION, time.time(), json.dumps(task.result())),
+        )
+        db.commit()
+
+def _location_key(location_query: str) -> str:
+    return " ".join(location_query.split()).lower()
+
+def _is_known_location(place: str) -> bool:
+    """Whether the location tool has already analyzed this place (in this process or persisted)."""
+    key = _location_key(place)
+    task = _location_cache.get(key)
+    if task is not None and task.done() and not task.cancelled() and task.exception() is None:
+        return isinstance(task.result(), dict)
+    return _stored_location(key) is not None
+
+def _location_task(location_query: str) -> asyncio.Task:
+    """Return the (possibly still running) analysis task for a location, starting one if needed."""
+    key = _location_key(location_query)
+    task = _location_cache.pop(key, None)
+    if task is None or not _task_reusable(task):
+        if len(_location_cache) >= MAX_LOCATION_CACHE:
+            # Drop the least recently used entry (dicts keep insertion order)
+            _location_cache.pop(next(iter(_location_cache)))
+        stored = _stored_location(key)
+        if stored is not None:
+            task = asyncio.get_running_loop().create_future()
+            task.set_result(stored)
+        else:
+            task = asyncio.create_task(analyze_location_query.ainvoke({"location_query": location_query.strip()}))
+            task.add_done_callback(functools.partial(_store_location, key))
+    _location_cache[key] = task
+    return task
+
+def _prefetch_location_analysis(location_query: str):
+    """Start analyzing a location in the background so search_database_node finds it ready."""
+    _location_task(location_query)
+
+async def _analyze_location(location_query: str):
+    """Return the location analysis, reusing a cached or in-flight result for the same query."""
+    return await _location_task(location_query)
+
+def _search_task(search_params: dict) -> asyncio.Task:
+    """Return the (possibly still running) search task for these parameters, starting one if needed."""
+    key = tuple(sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in search_params.items()))
+    cached = _search_cache.pop(key, None)
+    if cached is not None:
+        started, task = cached
+        usable = _task_reusable(task)
+        if usable and task.done():
+            # Failed searches are worth retrying, so only reuse real answers
+            usable = (time.monotonic() - started < SEARCH_CACHE_TTL
+                      and not task.result()["text"].startswith(("Database connection failed", "Database query failed")))
+        if usable:
+            _search_cache[key] = cached
+            return task
+    if len(_search_cache) >= MAX_SEARCH_CACHE:
+        _search_cache.pop(next(iter(_search_cache)))
+    task = asyncio.create_task(search_warehouses(**search_params))
+    _search_cache[key] = (time.monotonic(), task)
+    return task
+
+async def _search_warehouses(search_params: dict):
+    """Run the warehouse search, reusing results for identical parameters within SEARCH_CACHE_TTL.
+
+    Returns the structured result: {"text": rendered results, "ids": ids of the warehouses listed}.
+    """
+    return await _search_task(search_params)
 
 # (confirm_requirements_node, search_database_node, and human_input_node remain the same as before)
 async def confirm_requirements_node(state: GraphState) -> GraphState:
     """Confirm all requirements with the user before searching."""
-    print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Confirming requirements...")
-    print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Budget state - min: {state.budget_min}, max: {state.budget_max}")
-    summary_parts = []
-    
-    if state.location_query:
-        summary_parts.append(f"📍 Location: **{state.location_query}**")
-    if state.size_min is not None or state.size_max is not None:
-        size_range = f"**{state.size_min if state.size_min is not None else '0'} - {state.size_max if state.size_max is not None else 'any'} sqft**"
-        summary_parts.append(f"📦 Size: {size_range}")
-    
-    # Handle budget range display
-    if state.budget_min is not None or state.budget_max is not None:
-        if state.budget_min and state.budget_max:
-            budget_range = f"**₹{state.budget_min} - ₹{state.budget_max}/sqft**"
-            summary_parts.append(f"💰 Budget: {budget_range}")
-        elif state.budget_min:
-            summary_parts.append(f"💰 Budget: at least **₹{state.budget_min}/sqft**")
-        elif state.budget_max:
-            summary_parts.append(f"💰 Budget: up to **₹{state.budget_max}/sqft**")
-    if state.warehouse_type:
-        summary_parts.append(f"🏗️ Type: **{state.warehouse_type}**")
-    
-    # Add dock count
-    if state.min_docks is not None:
-        summary_parts.append(f"🚚 Min Docks: **{state.min_docks}**")
-    
-    # Add clear height
-    if state.min_clear_height is not None:
-        summary_parts.append(f"📏 Min Height: **{state.min_clear_height} ft**")
-    
-    # Add compliances
-    if state.compliances_query:
-        summary_parts.append(f"📋 Compliance: **{state.compliances_query}**")
-    
-    # Add availability
-    if state.availability:
-        summary_parts.append(f"⏰ Availability: **{state.availability}**")
-    
-    # Add zone preference
-    if state.zone:
-        summary_parts.append(f"🗺️ Zone: **{state.zone}**")
-    
-    # Add broker preference
-    if state.is_broker is not None:
-        broker_text = "Broker properties preferred" if state.is_broker else "Owner properties preferred"
-        summary_parts.append(f"🏢 Listing: **{broker_text}**")
-    
-    # Add fire NOC and land type requirements to the summary
-    if state.fire_noc_required:
-        summary_parts.append(f"🔥 Fire NOC: **Required**")
-    if state.land_type_industrial is not None:
-        land_type_text = "Industrial" if state.land_type_industrial else "Commercial/Flexible"
-        summary_parts.append(f"🏭 Land Type: **{land_type_text}**")
-    
+    logger.debug("Confirming requirements...")
+    logger.debug("Budget state - min: %s, max: %s", state.budget_min, state.budget_max)
     confirmation_message = (
         "Hope I captured your requirements well!\n\n" + 
-        "\n".join(summary_parts) + 
+        state.get_requirements_summary() + 
         "\n\nAre these parameters fine? (yes/no)"
     )
     state.add_message("assistant", confirmation_message)
-    print(f"{Fore.GREEN}[AGENT]{Style.RESET_ALL} {confirmation_message}")
+    _agent_print(confirmation_message)
+    
+    # Overlap the location analysis with the user's think time before they confirm
+    if _needs_location_analysis(state):
+        _prefetch_location_analysis(state.location_query)
+    
     state.next_action = "wait_for_user"
     return state
 
 async def search_database_node(state: GraphState) -> GraphState:
     # ... (no changes needed)
-    print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Searching database...")
-    print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Current budget state - min: {state.budget_min}, max: {state.budget_max}")
-    print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Location query: {state.location_query}")
-    print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Existing parsed_cities: {state.parsed_cities}")
-    print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Existing parsed_state: {state.parsed_state}")
-    print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Existing search_area: {state.search_area}")
-    print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Existing is_area_search: {state.is_area_search}")
-    
-    if state.location_query and not state.parsed_cities and not state.parsed_state and not state.search_area:
+    logger.debug("Searching database...")
+    logger.debug("Current budget state - min: %s, max: %s", state.budget_min, state.budget_max)
+    logger.debug("Location query: %s", state.location_query)
+    logger.debug("Existing parsed_cities: %s", state.parsed_cities)
+    logger.debug("Existing parsed_state: %s", state.parsed_state)
+    logger.debug("Existing search_area: %s", state.search_area)
+    logger.debug("Existing is_area_search: %s", state.is_area_search)
+    
+    if _needs_location_analysis(state):
         try:
-            print(f"{Fore.YELLOW}[TOOL]{Style.RESET_ALL} Analyzing location: {state.location_query}")
-            location_result = await analyze_location_query.ainvoke({"location_query": state.location_query})
-            print(f"{Fore.YELLOW}[TOOL RESULT]{Style.RESET_ALL} {location_result}")
+            logger.info("Analyzing location: %s", state.location_query)
+            location_result = await _analyze_location(state.location_query)
+            logger.debug("%s", location_result)
             if isinstance(location_result, dict):
                 # Handle area-specific searches first
                 if location_result.get("search_area") and location_result.get("search_city"):
@@ -1118,51 +1298,46 @@ async def search_database_node(state: GraphState) -> GraphState:
                     state.search_city = location_result["search_city"]
                     state.is_area_search = True
                     state.parsed_cities = [location_result["search_city"]]
-                    print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Area search detected - Area: {state.search_area}, City: {state.search_city}")
+                    logger.debug("Area search detected - Area: %s, City: %s", state.search_area, state.search_city)
                 elif location_result.get("is_area_search"):
                     state.is_area_search = True
                     if location_result.get("areas"):
                         state.search_area = location_result["areas"][0]  # Use first area
-                        print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Area indicators detected - Area: {state.search_area}")
+                        logger.debug("Area indicators detected - Area: %s", state.search_area)
                 
                 # Handle standard location results
                 if location_result.get("cities"):
                     if not state.parsed_cities:  # Don't override if already set by area search
                         state.parsed_cities = location_result["cities"]
-                    print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Parsed cities from tool: {state.parsed_cities}")
+                    logger.debug("Parsed cities from tool: %s", state.parsed_cities)
                 elif location_result.get("state"):
                     state.parsed_state = location_result["state"]
-                    print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Parsed state from tool: {state.parsed_state}")
+                    logger.debug("Parsed state from tool: %s", state.parsed_state)
                 elif not state.search_area:  # Only fallback if no area was detected
                     # If tool returns empty result, use original query as city
                     state.parsed_cities = [state.location_query]
-                    print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Tool returned empty, using original: {state.parsed_cities}")
+                    logger.debug("Tool returned empty, using original: %s", state.parsed_cities)
             else:
-                print(f"{Fore.RED}[ERROR]{Style.RESET_ALL} Location analysis tool returned an unexpected format.")
+                logger.error("Location analysis tool returned an unexpected format.")
                 state.parsed_cities = [state.location_query]
-                print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Using original location as fallback: {state.parsed_cities}")
+                logger.debug("Using original location as fallback: %s", state.parsed_cities)
         except Exception as e:
-            print(f"{Fore.RED}[ERROR]{Style.RESET_ALL} Location analysis failed: {e}")
+            logger.error("Location analysis failed: %s", e)
             # Simple fallback: use original query as city name
             state.parsed_cities = [state.location_query]
-            print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Using original location as fallback: {state.parsed_cities}")
+            logger.debug("Using original location as fallback: %s", state.parsed_cities)
     else:
-        print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Skipping location tool - using existing parsed data")
-    search_params = {
-        "cities": state.parsed_cities, "state": state.parsed_state, "search_area": state.search_area,
-        "search_address": state.search_address, "is_area_search": state.is_area_search,
-        "min_sqft": state.size_min, "max_sqft": state.size_max, "min_rate_per_sqft": state.budget_min, 
-        "max_rate_per_sqft": state.budget_max, "warehouse_type": state.warehouse_type, 
-        "compliances": state.compliances_query, "min_docks": state.min_docks,
-        "min_clear_height": state.min_clear_height, "availability": state.availability,
-        "zone": state.zone, "is_broker": state.is_broker, "page": state.current_page,
-        "fire_noc_required": state.fire_noc_required, "land_type_industrial": state.land_type_industrial
-    }
-    search_params = {k: v for k, v in search_params.items() if v is not None}
+        logger.debug("Skipping location tool - using existing parsed data")
+    search_params = {param: value for param, field in SEARCH_PARAM_FIELDS
+                     if (value := getattr(state, field)) is not None}
+    search_params["page"] = state.current_page
+    if state.current_page > 1 and state.search_cursor is not None:
+        search_params["after_id"] = state.search_cursor
     try:
-        print(f"{Fore.YELLOW}[TOOL]{Style.RESET_ALL} Searching with params: {search_params}")
-        search_results = await find_warehouses_in_db.ainvoke(search_params)
-        print(f"{Fore.YELLOW}[TOOL RESULT]{Style.RESET_ALL} Found results")
+        logger.info("Searching with params: %s", search_params)
+        search_result = await _search_warehouses(search_params)
+        search_results = search_result["text"]
+        logger.debug("Found results")
         state.search_results = search_results
         # Check if no results were found
         if "NO_RESULTS_FOUND:" in str(search_results) or "No warehouses found" in str(search_results) or "No more warehouses" in str(search_results):
@@ -1171,16 +1346,25 @@ async def search_database_node(state: GraphState) -> GraphState:
             else:
                 response_message = f"📄 That's all the results I found - {state.current_page-1} pages total. Want to try different search criteria to see more options?"
         else:
-            response_message = f"Search results - Page {state.current_page}:\n\n{search_results}"
+            # Collect the reply in pieces and join once at the end
+            parts = [f"Search results - Page {state.current_page}:\n\n{search_results}"]
             
             # Count the number of results to determine next actions
-            result_count = search_results.count("ID:")
+            result_count = len(search_result["ids"])
             
             if result_count >= 5:  # Full page, likely more results available
-                response_message += "\n\n💡 Type **'more'** for additional results."
+                parts.append("\n\n💡 Type **'more'** for additional results.")
+                # The next page continues below the lowest id shown, instead of re-scanning an OFFSET
+                state.search_cursor = min(search_result["ids"], default=None)
+                # Fetch the next page while the user reads this one, so "more" answers instantly
+                if state.current_page < MAX_PAGES:
+                    next_params = {**search_params, "page": state.current_page + 1}
+                    if state.search_cursor is not None:
+                        next_params["after_id"] = state.search_cursor
+                    _search_task(next_params)
             elif result_count > 0 and result_count < 5 and state.current_page == 1:
                 # Limited results on first page - offer to relax criteria
-                response_message += f"\n\n🔍 Found {result_count} result{'s' if result_count != 1 else ''}. Would you like to relax any criteria to find more options?\n\n"
+                parts.append(f"\n\n🔍 Found {result_count} result{'s' if result_count != 1 else ''}. Would you like to relax any criteria to find more options?\n\n")
                 
                 # Suggest specific relaxations based on current criteria
                 relaxation_options = []
@@ -1197,205 +1381,165 @@ async def search_database_node(state: GraphState) -> GraphState:
                     relaxation_options.append(f"🏗️ **Warehouse type** (currently {state.warehouse_type})")
                 
                 if relaxation_options:
-                    response_message += "Options to relax:\n" + "\n".join(relaxation_options)
-                    response_message += "\n\nType which criteria to relax (e.g., 'size', 'land type', 'budget') or 'none' to keep current results."
+                    parts.append("Options to relax:\n")
+                    parts.append("\n".join(relaxation_options))
+                    parts.append("\n\nType which criteria to relax (e.g., 'size', 'land type', 'budget') or 'none' to keep current results.")
                 else:
-                    response_message += "Type 'search in nearby areas' to expand location, or 'none' to keep current results."
+                    parts.append("Type 'search in nearby areas' to expand location, or 'none' to keep current results.")
             # If fewer than 5 results on subsequent pages, don't show "more" (this is the end)
+            response_message = "".join(parts)
         state.add_message("assistant", response_message)
-        print(f"{Fore.GREEN}[AGENT]{Style.RESET_ALL} {response_message}")
+        _agent_print(response_message)
     except Exception as e:
         error_message = f"😬 Uh oh, I hit a snag while searching. Here's the technical error: {str(e)}"
         state.add_message("assistant", error_message)
-        print(f"{Fore.RED}[ERROR]{Style.RESET_ALL} {error_message}")
+        logger.error("%s", error_message)
     state.next_action = "wait_for_user"
     return state
 
-async def _handle_criteria_relaxation(state: GraphState, user_message: str):
-    """Handle user requests to relax search criteria for more results."""
-    user_message_lower = user_message.lower()
-    
-    print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Handling criteria relaxation: {user_message}")
-    
-    # Size relaxation
-    if any(keyword in user_message_lower for keyword in ["size", "sqft", "square feet", "bigger", "smaller"]):
-        if state.size_min and state.size_max:
-            # Expand size range by 30%
-            current_range = state.size_max - state.size_min
-            expansion = int(current_range * 0.3)
-            state.size_min = max(0, state.size_min - expansion)
-            state.size_max = state.size_max + expansion
-            print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Relaxed size range to: {state.size_min} - {state.size_max} sqft")
-        elif state.size_min:
-            # Reduce minimum by 30%
-            state.size_min = int(state.size_min * 0.7)
-            print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Reduced minimum size to: {state.size_min} sqft")
-        elif state.size_max:
-            # Increase maximum by 50%
-            state.size_max = int(state.size_max * 1.5)
-            print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Increased maximum size to: {state.size_max} sqft")
-    
-    # Land type relaxation
-    elif any(keyword in user_message_lower for keyword in ["land type", "land", "industrial", "commercial"]):
-        if state.land_type_industrial is not None:
-            state.land_type_industrial = None  # Accept both industrial and commercial
-            print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Relaxed land type to accept both Industrial and Commercial")
-    
-    # Budget relaxation
-    elif any(keyword in user_message_lower for keyword in ["budget", "price", "rate", "cost", "cheaper", "expensive"]):
-        if state.budget_min and state.budget_max:
-            # Expand budget range by 20%
-            current_range = state.budget_max - state.budget_min
-            expansion = int(current_range * 0.2)
-            state.budget_min = max(0, state.budget_min - expansion)
-            state.budget_max = state.budget_max + expansion
-            print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Relaxed budget range to: ₹{state.budget_min} - ₹{state.budget_max}/sqft")
-        elif state.budget_min:
-            # Reduce minimum budget by 20%
-            state.budget_min = int(state.budget_min * 0.8)
-            print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Reduced minimum budget to: ₹{state.budget_min}/sqft")
-        elif state.budget_max:
-            # Increase maximum budget by 20%
-            state.budget_max = int(state.budget_max * 1.2)
-            print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Increased maximum budget to: ₹{state.budget_max}/sqft")
-        else:
-            # If no budget set, don't add one (keep it flexible)
-            pass
+def _relax_size(state: GraphState):
+    """Widen the size range by 30%, or loosen whichever bound is set."""
+    if state.size_min and state.size_max:
+        # Expand size range by 30%
+        current_range = state.size_max - state.size_min
+        expansion = int(current_range * 0.3)
+        state.size_min = max(0, state.size_min - expansion)
+        state.size_max = state.size_max + expansion
+        logger.debug("Relaxed size range to: %s - %s sqft", state.size_min, state.size_max)
+    elif state.size_min:
+        # Reduce minimum by 30%
+        state.size_min = int(state.size_min * 0.7)
+        logger.debug("Reduced minimum size to: %s sqft", state.size_min)
+    elif state.size_max:
+        # Increase maximum by 50%
+        state.size_max = int(state.size_max * 1.5)
+        logger.debug("Increased maximum size to: %s sqft", state.size_max)
+
+def _relax_land_type(state: GraphState):
+    """Accept both industrial and commercial land."""
+    if state.land_type_industrial is not None:
+        state.land_type_industrial = None  # Accept both industrial and commercial
+        logger.debug("Relaxed land type to accept both Industrial and Commercial")
+
+def _relax_budget(state: GraphState):
+    """Widen the budget range by 20%, or loosen whichever bound is set."""
+    if state.budget_min and state.budget_max:
+        # Expand budget range by 20%
+        current_range = state.budget_max - state.budget_min
+        expansion = int(current_range * 0.2)
+        state.budget_min = max(0, state.budget_min - expansion)
+        state.budget_max = state.budget_max + expansion
+        logger.debug("Relaxed budget range to: ₹%s - ₹%s/sqft", state.budget_min, state.budget_max)
+    elif state.budget_min:
+        # Reduce minimum budget by 20%
+        state.budget_min = int(state.budget_min * 0.8)
+        logger.debug("Reduced minimum budget to: ₹%s/sqft", state.budget_min)
+    elif state.budget_max:
+        # Increase maximum budget by 20%
+        state.budget_max = int(state.budget_max * 1.2)
+        logger.debug("Increased maximum budget to: ₹%s/sqft", state.budget_max)
+    else:
+        # If no budget set, don't add one (keep it flexible)
+        pass
+
+def _relax_fire_noc(state: GraphState):
+    """Drop the Fire NOC requirement."""
+    if state.fire_noc_required:
+        state.fire_noc_required = False
+        logger.debug("Relaxed Fire NOC requirement")
+
+def _relax_warehouse_type(state: GraphState):
+    """Accept all warehouse types."""
+    if state.warehouse_type:
+        state.warehouse_type = None  # Accept all warehouse types
+        logger.debug("Relaxed warehouse type to accept all types")
+
+def _relax_most_restrictive(state: GraphState):
+    """General relaxation - relax the most restrictive criterion that is set."""
+    relaxed_something = False
     
-    # Fire NOC relaxation
-    elif any(keyword in user_message_lower for keyword in ["fire noc", "fire", "noc", "compliance"]):
-        if state.fire_noc_required:
-            state.fire_noc_required = False
-            print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Relaxed Fire NOC requirement")
+    # Relax land type first (common restriction)
+    if state.land_type_industrial is not None:
+        state.land_type_industrial = None
+        logger.debug("Relaxed land type to accept both")
+        relaxed_something = True
+    
+    # Then relax fire NOC if set
+    elif state.fire_noc_required:
+        state.fire_noc_required = False
+        logger.debug("Relaxed Fire NOC requirement")
+        relaxed_something = True
+    
+    # Then expand size range if very specific
+    elif state.size_min and state.size_max and (state.size_max - state.size_min) < 10000:
+        expansion = int((state.size_max - state.size_min) * 0.5)
+        state.size_min = max(0, state.size_min - expansion)
+        state.size_max = state.size_max + expansion
+        logger.debug("Expanded size range to: %s - %s sqft", state.size_min, state.size_max)
+        relaxed_something = True
+    
+    if not relaxed_something:
+        logger.debug("No specific criteria to relax")
+
+_RELAXERS = {
+    "size": _relax_size,
+    "land_type": _relax_land_type,
+    "budget": _relax_budget,
+    "fire_noc": _relax_fire_noc,
+    "warehouse_type": _relax_warehouse_type,
+    "all": _relax_most_restrictive,
+}
+
+async def _handle_criteria_relaxation(state: GraphState, user_message: str, user_message_lower: str):
+    """Handle user requests to relax search criteria for more results."""
     
-    # Warehouse type relaxation
-    elif any(keyword in user_message_lower for keyword in ["type", "structure", "peb", "rcc", "shed"]):
-        if state.warehouse_type:
-            state.warehouse_type = None  # Accept all warehouse types
-            print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Relaxed warehouse type to accept all types")
+    logger.debug("Handling criteria relaxation: %s", user_message)
     
-    # General relaxation - relax the most restrictive criteria
-    elif any(keyword in user_message_lower for keyword in ["all", "everything", "any", "general", "loosen"]):
-        relaxed_something = False
-        
-        # Relax land type first (common restriction)
-        if state.land_type_industrial is not None:
-            state.land_type_industrial = None
-            print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Relaxed land type to accept both")
-            relaxed_something = True
-        
-        # Then relax fire NOC if set
-        elif state.fire_noc_required:
-            state.fire_noc_required = False
-            print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Relaxed Fire NOC requirement")
-            relaxed_something = True
-        
-        # Then expand size range if very specific
-        elif state.size_min and state.size_max and (state.size_max - state.size_min) < 10000:
-            expansion = int((state.size_max - state.size_min) * 0.5)
-            state.size_min = max(0, state.size_min - expansion)
-            state.size_max = state.size_max + expansion
-            print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Expanded size range to: {state.size_min} - {state.size_max} sqft")
-            relaxed_something = True
-        
-        if not relaxed_something:
-            print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} No specific criteria to relax")
+    relax = _RELAXERS.get(_relaxation_category(user_message_lower))
+    if relax:
+        relax(state)
+
+LOCATION_CHANGE_EXTRACTION_SYSTEM_PROMPT = """Extract location from user message.
+Extract city/location name from the message. Look for city names after words like 'switch to', 'change to', 'make city', etc."""
+
+LOCATION_CHANGE_EXTRACTION_CHAIN = _LazyChain(lambda: ChatPromptTemplate.from_messages([
+    SystemMessage(content=LOCATION_CHANGE_EXTRACTION_SYSTEM_PROMPT),
+    ("user", "Extract location: {message}")
+]) | _get_extraction_llm())
 
 async def _parse_location_change(state: GraphState, user_message: str):
     """Parse location change requests and update state accordingly."""
     try:
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", """Extract location from user message. Return ONLY JSON:
-            {{"location_query": null}}
-            Extract city/location name from the message. Look for city names after words like 'switch to', 'change to', 'make city', etc."""),
-            ("user", "Extract location: {message}")
-        ])
-        
-        chain = prompt | llm
-        response = await chain.ainvoke({"message": user_message})
-        content = response.content.strip()
-        json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', content, re.DOTALL)
-        json_str = json_match.group(1) if json_match else content
-        parsed_data = json.loads(json_str)
+        parsed_data = await _extract_requirements(LOCATION_CHANGE_EXTRACTION_CHAIN, user_message)
         
         if parsed_data.get("location_query"):
             state.location_query = parsed_data["location_query"]
             state.parsed_cities = None
             state.parsed_state = None
             state.current_page = 1
+            state.search_cursor = None
             state.search_results = None
             state.requirements_confirmed = False
-            print(f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} Updated location to: {state.location_query}")
+            logger.debug("Updated location to: %s", state.location_query)
         else:
-            print(f"{Fore.YELLOW}[DEBUG]{Style.RESET_ALL} No location found in message: {user_message}")
+            logger.debug("No location found in message: %s", user_message)
     except Exception as e:
-        print(f"{Fore.RED}[ERROR]{Style.RESET_ALL} Failed to parse location change: {e}")
+        logger.error("Failed to parse location change: %s", e)
 
 async def _show_updated_requirements(state: GraphState):
     """Show updated requirements summary after parameter changes."""
-    summary_parts = []
-    
-    if state.location_query:
-        summary_parts.append(f"📍 Location: **{state.location_query}**")
-    if state.size_min is not None or state.size_max is not None:
-        size_range = f"**{state.size_min if state.size_min is not None else '0'} - {state.size_max if state.size_max is not None else 'any'} sqft**"
-        summary_parts.append(f"📦 Size: {size_range}")
-    
-    # Handle budget range display
-    if state.budget_min is not None or state.budget_max is not None:
-        if state.budget_min and state.budget_max:
-            budget_range = f"**₹{state.budget_min} - ₹{state.budget_max}/sqft**"
-            summary_parts.append(f"💰 Budget: {budget_range}")
-        elif state.budget_min:
-            summary_parts.append(f"💰 Budget: at least **₹{state.budget_min}/sqft**")
-        elif state.budget_max:
-            summary_parts.append(f"💰 Budget: up to **₹{state.budget_max}/sqft**")
-            
-    if state.warehouse_type:
-        summary_parts.append(f"🏗️ Type: **{state.warehouse_type}**")
-    
-    # Add dock count
-    if state.min_docks is not None:
-        summary_parts.append(f"🚚 Min Docks: **{state.min_docks}**")
-    
-    # Add clear height
-    if state.min_clear_height is not None:
-        summary_parts.append(f"📏 Min Height: **{state.min_clear_height} ft**")
-    
-    # Add compliances
-    if state.compliances_query:
-        summary_parts.append(f"📋 Compliance: **{state.compliances_query}**")
-    
-    # Add availability
-    if state.availability:
-        summary_parts.append(f"⏰ Availability: **{state.availability}**")
-    
-    # Add zone preference
-    if state.zone:
-        summary_parts.append(f"🗺️ Zone: **{state.zone}**")
-    
-    # Add broker preference
-    if state.is_broker is not None:
-        broker_text = "Broker properties preferred" if state.is_broker else "Owner properties preferred"
-        summary_parts.append(f"🏢 Listing: **{broker_text}**")
-    
-    # Add fire NOC and land type requirements to the summary
-    if state.fire_noc_required:
-        summary_parts.append(f"🔥 Fire NOC: **Required**")
-    if state.land_type_industrial is not None:
-        land_type_text = "Industrial" if state.land_type_industrial else "Commercial/Flexible"
-        summary_parts.append(f"🏭 Land Type: **{land_type_text}**")
+    summary = state.get_requirements_summary()
     
-    if summary_parts:
-        updated_message = "Updated requirements:\n\n" + "\n".join(summary_parts) + "\n\nProceed with search? (yes/no)"
+    if summary:
+        updated_message = "Updated requirements:\n\n" + summary + "\n\nProceed with search? (yes/no)"
         state.add_message("assistant", updated_message)
-        print(f"{Fore.GREEN}[AGENT]{Style.RESET_ALL} {updated_message}")
+        _agent_print(updated_message)
         state.next_action = "wait_for_user"
     else:
         # If no summary to show, at least acknowledge the update
         acknowledge_message = "Parameters updated. Proceed with search? (yes/no)"
         state.add_message("assistant", acknowledge_message)
-        print(f"{Fore.GREEN}[AGENT]{Style.RESET_ALL} {acknowledge_message}")
+        _agent_print(acknowledge_message)
         state.next_action = "wait_for_user"
 
 async def human_input_node(state: GraphState) -> GraphState:
@@ -1,16 +1,26 @@
+import asyncio
+import hashlib
 import os
+import sqlite3
 import sys
+from array import array
 import psycopg2
+from psycopg2.extras import execute_values
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI, RateLimitError
 
 # --- CONFIGURATION ---
 load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_BATCH_SIZE = 512  # inputs per embeddings request (API allows up to 2048)
+EMBEDDING_MAX_RETRIES = 5
+EMBEDDING_CONCURRENCY = 32  # embeddings requests in flight at once
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", ".embedding_cache.sqlite3")
 
 # Initialize API clients
-openai_client = OpenAI(api_key=OPENAI_API_KEY)
+openai_client = AsyncOpenAI(api_key=OPENAI_API_KEY)
 
 # --- DATABASE HELPER ---
 def get_db_connection():
@@ -22,72 +32,163 @@ def get_db_connection():
         sys.exit(1)
 
 # --- API HELPER ---
-def get_embedding(text):
-    """Generates a vector embedding for a given text block."""
-    try:
-        response = openai_client.embeddings.create(
-            model="text-embedding-3-small",
-            input=text
-        )
-        return response.data[0].embedding
-    except Exception as e:
-        print(f"Error getting embedding: {e}")
-        return None
+async def get_embeddings(texts):
+    """Generates vector embeddings for a batch of text blocks in a single request.
+
+    Retries with exponential backoff when rate limited; returns None if the batch fails.
+    """
+    for attempt in range(EMBEDDING_MAX_RETRIES):
+        try:
+            response = await openai_client.embeddings.create(
+                model=EMBEDDING_MODEL,
+                input=texts
+            )
+            return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+        except RateLimitError:
+            delay = 2 ** attempt
+            print(f"Rate limited, retrying in {delay}s...")
+            await asyncio.sleep(delay)
+        except Exception as e:
+            print(f"Error getting embeddings: {e}")
+            return None
+    print("Error getting embeddings: still rate limited after retries")
+    return None
+
+async def embed_batches(batches):
+    """Embeds several batches concurrently, keeping at most EMBEDDING_CONCURRENCY requests in flight."""
+    semaphore = asyncio.Semaphore(EMBEDDING_CONCURRENCY)
+
+    async def embed(texts):
+        async with semaphore:
+            return await get_embeddings(texts)
+
+    return await asyncio.gather(*(embed(texts) for texts in batches))
+
+# --- EMBEDDING CACHE ---
+def open_embedding_cache():
+    """Opens (creating if needed) the local SQLite cache of previously generated embeddings."""
+    cache = sqlite3.connect(EMBEDDING_CACHE_PATH)
+    cache.execute("CREATE TABLE IF NOT EXISTS emb_cache (h TEXT PRIMARY KEY, vec BLOB)")
+    return cache
+
+def embedding_cache_key(text):
+    """Content hash of the normalized text (and model), so unchanged addresses hit the cache."""
+    normalized = " ".join(text.lower().split())
+    return hashlib.sha256(f"{EMBEDDING_MODEL}:{normalized}".encode()).hexdigest()
+
+def get_cached_embeddings(cache, keys):
+    """Returns {key: embedding} for every key already in the cache."""
+    placeholders = ",".join("?" * len(keys))
+    rows = cache.execute(f"SELECT h, vec FROM emb_cache WHERE h IN ({placeholders})", keys)
+    return {h: array("f", vec).tolist() for h, vec in rows}
+
+def store_embeddings(cache, items):
+    """Stores (key, embedding) pairs as packed float32 blobs."""
+    cache.executemany(
+        "INSERT OR REPLACE INTO emb_cache (h, vec) VALUES (?, ?)",
+        [(h, array("f", embedding).tobytes()) for h, embedding in items],
+    )
+    cache.commit()
 
 # --- MAIN SCRIPT ---
 def main():
     """Updates the embedding column for all warehouses based on location."""
     conn = get_db_connection()
     cur = conn.cursor()
+    cache = open_embedding_cache()
+
+    # Hash of the text each stored embedding was generated from, so unchanged rows can be skipped.
+    # The column is added by indexes.sql; this script doesn't change the schema itself.
+    cur.execute("""
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'WarehouseData' AND column_name = 'embeddingSourceHash';
+    """)
+    if cur.fetchone() is None:
+        print('Error: column "WarehouseData"."embeddingSourceHash" is missing. Apply indexes.sql first: psql "$DATABASE_URL" -f indexes.sql')
+        sys.exit(1)
 
     # 1. Fetch the location info for ALL warehouses from the main table
     cur.execute("""
-        SELECT id, address, city, state
-        FROM "Warehouse";
+        SELECT w.id, w.address, w.city, w.state, wd."embeddingSourceHash"
+        FROM "Warehouse" w
+        LEFT JOIN "WarehouseData" wd ON wd."warehouseId" = w.id;
     """)
-    warehouses_to_process = cur.fetchall()
+    warehouses = cur.fetchall()
+
+    # 2. Create the location-only text for each warehouse; rows whose text is unchanged are done
+    warehouses_to_process = []
+    keys = []
+    texts = {}
+    for warehouse_id, address, city, state, source_hash in warehouses:
+        text = f"Warehouse located at: {address}, {city}, {state}."
+        key = embedding_cache_key(text)
+        if key == source_hash:
+            continue
+        warehouses_to_process.append(warehouse_id)
+        keys.append(key)
+        texts[key] = text
 
-    print(f"Found {len(warehouses_to_process)} warehouses. Starting embedding update process...")
+    print(f"Found {len(warehouses)} warehouses, {len(warehouses_to_process)} new or changed. Starting embedding update process...")
 
-    for row in warehouses_to_process:
-        warehouse_id, address, city, state = row
-        print(f"\nProcessing Warehouse ID: {warehouse_id}...")
+    # Reuse any embedding already in the local cache
+    embeddings = {}
+    unique_keys = list(texts)
+    for start in range(0, len(unique_keys), EMBEDDING_BATCH_SIZE):
+        embeddings.update(get_cached_embeddings(cache, unique_keys[start:start + EMBEDDING_BATCH_SIZE]))
 
-        # 2. Create the location-only text for the new embedding
-        text_for_embedding = f"Warehouse located at: {address}, {city}, {state}."
+    # 3. Embed the rest in batches, with several batch requests running concurrently
+    misses = [key for key in unique_keys if key not in embeddings]
+    batches = [misses[start:start + EMBEDDING_BATCH_SIZE] for start in range(0, len(misses), EMBEDDING_BATCH_SIZE)]
+    print(f"{len(embeddings)} embeddings reused from cache, generating {len(misses)} in {len(batches)} batches...")
 
-        embedding = get_embedding(text_for_embedding)
-        if not embedding:
-            print("  -> Embedding generation failed. Skipping.")
+    results = asyncio.run(embed_batches([[texts[key] for key in batch] for batch in batches]))
+    for batch, batch_embeddings in zip(batches, results):
+        if not batch_embeddings:
+            print(f"  -> Embedding generation failed for a batch of {len(batch)}. Skipping it.")
             continue
-        print("  -> New embedding generated.")
+        new_items = list(zip(batch, batch_embeddings))
+        store_embeddings(cache, new_items)
+        embeddings.update(new_items)
 
-        # 3. Execute a targeted UPDATE command
-        # This ONLY changes the 'embedding' column and leaves all others untouched.
-        try:
-            embedding_str = str(embedding)
-            cur.execute(
-                """
-                UPDATE "WarehouseData"
-                SET embedding = %s
-                WHERE "warehouseId" = %s;
-                """,
-                (embedding_str, warehouse_id)
-            )
-            
-            # Check if a row was actually updated
-            if cur.rowcount > 0:
-                conn.commit()
-                print(f"  -> Successfully updated embedding for Warehouse ID {warehouse_id}.")
-            else:
-                # This handles cases where a warehouse exists but has no entry in WarehouseData
-                print(f"  -> WARNING: No row in WarehouseData for Warehouse ID {warehouse_id}. No update performed.")
+    updates = []
+    for warehouse_id, key in zip(warehouses_to_process, keys):
+        embedding = embeddings.get(key)
+        if embedding is None:
+            print(f"  -> No embedding for Warehouse ID {warehouse_id}. Skipping.")
+            continue
+        updates.append((str(embedding), key, warehouse_id))
 
+    # 4. Write every embedding with one UPDATE ... FROM (VALUES ...) and a single commit
+    # This ONLY changes the embedding and its source hash and leaves all other columns untouched.
+    try:
+        updated = execute_values(
+            cur,
+            """
+            UPDATE "WarehouseData"
+            SET embedding = data.emb, "embeddingSourceHash" = data.source_hash
+            FROM (VALUES %s) AS data(emb, source_hash, wid)
+            WHERE "warehouseId" = data.wid
+            RETURNING "warehouseId";
+            """,
+            updates,
+            template="(%s::vector, %s, %s)",
+            page_size=EMBEDDING_BATCH_SIZE,
+            fetch=True,
+        )
+        conn.commit()
+        updated_ids = {row[0] for row in updated}
+        print(f"  -> Successfully updated embeddings for {len(updated_ids)} warehouses.")
 
-        except Exception as e:
-            print(f"  -> Database update failed: {e}")
-            conn.rollback()
+        # This handles cases where a warehouse exists but has no entry in WarehouseData
+        for _, _, warehouse_id in updates:
+            if warehouse_id not in updated_ids:
+                print(f"  -> WARNING: No row in WarehouseData for Warehouse ID {warehouse_id}. No update performed.")
+
+    except Exception as e:
+        print(f"  -> Database update failed: {e}")
+        conn.rollback()
 
+    cache.close()
     cur.close()
     conn.close()
     print("\nUpdate process complete.")
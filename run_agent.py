@@ -11,14 +11,6 @@ from pathlib import Path
 # Add the current directory to Python path for imports
 sys.path.append(str(Path(__file__).parent))
 
-try:
-    from langgraph_warehouse_agent import run_cli_chatbot
-except ImportError as e:
-    print(f"❌ Import error: {e}")
-    print("Make sure you have installed all requirements:")
-    print("pip install -r requirements.txt")
-    sys.exit(1)
-
 def main():
     """Main entry point."""
     try:
@@ -30,6 +22,16 @@ def main():
             print("OPENAI_API_KEY=sk-...")
             print()
         
+        # Imported only now: the agent pulls in LangChain, OpenAI and the DB drivers, which takes a
+        # noticeable moment, so the .env check above reports instantly
+        try:
+            from langgraph_warehouse_agent import run_cli_chatbot
+        except ImportError as e:
+            print(f"❌ Import error: {e}")
+            print("Make sure you have installed all requirements:")
+            print("pip install -r requirements.txt")
+            sys.exit(1)
+        
         # Run the async chatbot
         asyncio.run(run_cli_chatbot())
         
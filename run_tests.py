@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Run the agent test scripts in a single process.
+
+Each test_*.py can still be run on its own; running them from here pays the LangChain/LangGraph
+import and client set-up once instead of once per script.
+"""
+
+import asyncio
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from utils.llm_client import close_http_client
+from tools.database_tool import close_pool
+from test_area_detection import test_area_detection
+from test_workflow import test_area_search_workflow
+from test_complete_workflow import test_complete_area_workflow
+from test_size_update import test_size_update
+
+# Run one after another so each script's output stays readable
+TESTS = [
+    test_area_detection,
+    test_area_search_workflow,
+    test_complete_area_workflow,
+    test_size_update,
+]
+
+async def main():
+    try:
+        for test in TESTS:
+            await test()
+    finally:
+        await close_http_client()
+        await close_pool()
+
+if __name__ == "__main__":
+    asyncio.run(main())
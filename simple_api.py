@@ -43,6 +43,16 @@ class ChatResponse(BaseModel):
 # Global graph variable
 warehouse_graph = None
 
+GREETING = (
+    "👋 Welcome to WareOnGo's warehouse discovery platform.\n\n"
+    "I'll help you find suitable warehouse spaces through a quick 3-step process:\n"
+    "1️⃣ Location & Size\n"
+    "2️⃣ Land classification\n"
+    "3️⃣ Additional requirements\n\n"
+    "What location are you considering?"
+)
+SEARCH_COMMANDS = frozenset({"show me", "search", "find"})
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize the LangGraph workflow on startup"""
@@ -69,18 +79,9 @@ async def health_check():
 async def start_conversation():
     """Start conversation - just return greeting without complex workflow"""
     
-    greeting = (
-        "👋 Welcome to WareOnGo's warehouse discovery platform.\n\n"
-        "I'll help you find suitable warehouse spaces through a quick 3-step process:\n"
-        "1️⃣ Location & Size\n"
-        "2️⃣ Land classification\n"
-        "3️⃣ Additional requirements\n\n"
-        "What location are you considering?"
-    )
-    
     context = SimpleContext(current_stage="area_size")
     
-    return ChatResponse(message=greeting, context=context)
+    return ChatResponse(message=GREETING, context=context)
 
 @app.post("/chat")
 async def chat_endpoint(request: ChatRequest):
@@ -91,6 +92,7 @@ async def chat_endpoint(request: ChatRequest):
     
     # For now, just echo the message and update context
     context = request.context or SimpleContext()
+    message_lower = request.message.lower()
     
     # Simple stage progression logic
     if context.current_stage == "area_size" and request.message:
@@ -104,7 +106,7 @@ async def chat_endpoint(request: ChatRequest):
         )
     
     elif context.current_stage == "business_nature":
-        context.land_type_preference = "yes" if "yes" in request.message.lower() else "no"
+        context.land_type_preference = "yes" if "yes" in message_lower else "no"
         context.conversation_history.append(request.message)
         context.current_stage = "specifics"
         
@@ -114,7 +116,7 @@ async def chat_endpoint(request: ChatRequest):
         )
     
     elif context.current_stage == "specifics":
-        if request.message.lower() not in ["show me", "search", "find"]:
+        if message_lower not in SEARCH_COMMANDS:
             context.specific_requirements.append(request.message)
         context.conversation_history.append(request.message)
         
@@ -2,12 +2,28 @@
 from typing import Optional, List, Dict
 from dataclasses import dataclass, field
 
+# Fields that get_missing_requirements() depends on; assigning any of them drops the cached result
+_MISSING_REQUIREMENT_FIELDS = frozenset({
+    "workflow_stage", "location_query", "size_min", "size_max", "land_type_industrial",
+})
+
+_WORKFLOW_STAGES = ("area_and_size", "land_type_preference", "specifics")
+
+# Fields shown in the requirements summary; assigning any of them drops the rendered summary
+_SUMMARY_FIELDS = frozenset({
+    "location_query", "size_min", "size_max", "budget_min", "budget_max", "warehouse_type",
+    "min_docks", "min_clear_height", "compliances_query", "availability", "zone", "is_broker",
+    "fire_noc_required", "land_type_industrial",
+})
+
 @dataclass
 class GraphState:
     """Central state object that tracks the conversation and user requirements."""
     
     # Conversation tracking
     messages: List[Dict[str, str]] = field(default_factory=list)
+    last_user_message: Optional[str] = None
+    last_assistant_message: Optional[str] = None
     
     # User requirements (slot-filling)
     location_query: Optional[str] = None
@@ -36,6 +52,7 @@ class GraphState:
     # Search state
     search_results: Optional[str] = None
     current_page: int = 1
+    search_cursor: Optional[int] = None  # id of the last warehouse shown; the next page starts below it
     requirements_confirmed: bool = False
     
     # Flow control - Enhanced for 3-state workflow
@@ -43,12 +60,52 @@ class GraphState:
     next_action: str = "gather_requirements"
     conversation_complete: bool = False
     
+    def __post_init__(self):
+        # Derived caches, kept out of the dataclass fields so they are never checkpointed
+        # (_history_lines is built whenever messages is assigned, see __setattr__)
+        self._missing_cache = None
+        self._summary_cache = None
+        # Backfill the tail pointers when the state was built from a bare message list
+        if self.messages and self.last_user_message is None and self.last_assistant_message is None:
+            for msg in reversed(self.messages):
+                if msg["role"] == "user" and self.last_user_message is None:
+                    self.last_user_message = msg["content"]
+                elif msg["role"] == "assistant" and self.last_assistant_message is None:
+                    self.last_assistant_message = msg["content"]
+                if self.last_user_message is not None and self.last_assistant_message is not None:
+                    break
+    
+    def __setattr__(self, name, value):
+        if name == "messages":
+            self.__dict__["_history_lines"] = [f"{msg['role'].title()}: {msg['content']}" for msg in value]
+        if name in _MISSING_REQUIREMENT_FIELDS:
+            self.__dict__["_missing_cache"] = None
+        if name in _SUMMARY_FIELDS:
+            self.__dict__["_summary_cache"] = None
+        super().__setattr__(name, value)
+    
     def add_message(self, role: str, content: str):
         """Add a message to the conversation history."""
         self.messages.append({"role": role, "content": content})
+        self._history_lines.append(f"{role.title()}: {content}")
+        if role == "user":
+            self.last_user_message = content
+        elif role == "assistant":
+            self.last_assistant_message = content
+    
+    def get_history(self, last_n: Optional[int] = None) -> str:
+        """Conversation history formatted as 'Role: content' lines for LLM prompts.
+        
+        When last_n is given only the most recent last_n messages are included.
+        """
+        lines = self._history_lines[-last_n:] if last_n else self._history_lines
+        return "\n".join(lines)
     
     def get_missing_requirements(self) -> List[str]:
         """Identify which requirements are still missing based on current workflow stage."""
+        if self._missing_cache is not None:
+            return list(self._missing_cache)
+        
         missing = []
         
         if self.workflow_stage == "area_and_size":
@@ -62,17 +119,61 @@ class GraphState:
         elif self.workflow_stage == "specifics":
             # In specifics stage, nothing is mandatory but we gather optional items
             pass
-            
-        return missing
+        
+        self._missing_cache = missing
+        return list(missing)
+    
+    def get_requirements_summary(self) -> str:
+        """Requirements collected so far, one formatted line per field ("" if none are set)."""
+        if self._summary_cache is not None:
+            return self._summary_cache
+        
+        summary_parts = []
+        
+        if self.location_query:
+            summary_parts.append(f"📍 Location: **{self.location_query}**")
+        if self.size_min is not None or self.size_max is not None:
+            size_range = f"**{self.size_min if self.size_min is not None else '0'} - {self.size_max if self.size_max is not None else 'any'} sqft**"
+            summary_parts.append(f"📦 Size: {size_range}")
+        
+        # Handle budget range display
+        if self.budget_min is not None or self.budget_max is not None:
+            if self.budget_min and self.budget_max:
+                budget_range = f"**₹{self.budget_min} - ₹{self.budget_max}/sqft**"
+                summary_parts.append(f"💰 Budget: {budget_range}")
+            elif self.budget_min:
+                summary_parts.append(f"💰 Budget: at least **₹{self.budget_min}/sqft**")
+            elif self.budget_max:
+                summary_parts.append(f"💰 Budget: up to **₹{self.budget_max}/sqft**")
+        if self.warehouse_type:
+            summary_parts.append(f"🏗️ Type: **{self.warehouse_type}**")
+        if self.min_docks is not None:
+            summary_parts.append(f"🚚 Min Docks: **{self.min_docks}**")
+        if self.min_clear_height is not None:
+            summary_parts.append(f"📏 Min Height: **{self.min_clear_height} ft**")
+        if self.compliances_query:
+            summary_parts.append(f"📋 Compliance: **{self.compliances_query}**")
+        if self.availability:
+            summary_parts.append(f"⏰ Availability: **{self.availability}**")
+        if self.zone:
+            summary_parts.append(f"🗺️ Zone: **{self.zone}**")
+        if self.is_broker is not None:
+            broker_text = "Broker properties preferred" if self.is_broker else "Owner properties preferred"
+            summary_parts.append(f"🏢 Listing: **{broker_text}**")
+        if self.fire_noc_required:
+            summary_parts.append("🔥 Fire NOC: **Required**")
+        if self.land_type_industrial is not None:
+            land_type_text = "Industrial" if self.land_type_industrial else "Commercial/Flexible"
+            summary_parts.append(f"🏭 Land Type: **{land_type_text}**")
+        
+        self._summary_cache = "\n".join(summary_parts)
+        return self._summary_cache
     
     def is_ready_for_next_stage(self) -> bool:
         """Check if we can move to the next workflow stage."""
-        if self.workflow_stage == "area_and_size":
-            return bool(self.location_query and (self.size_min or self.size_max))
-        elif self.workflow_stage == "land_type_preference":
-            return self.land_type_industrial is not None
-        elif self.workflow_stage == "specifics":
-            return True  # Always ready to proceed from specifics
+        if self.workflow_stage in _WORKFLOW_STAGES:
+            # Ready exactly when nothing is missing; reuses the memoized check (specifics never misses anything)
+            return not self.get_missing_requirements()
         return False
     
     def advance_workflow_stage(self):
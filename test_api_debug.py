@@ -32,19 +32,18 @@ async def debug_api_workflow():
         print(f"📋 Result keys: {list(result.keys()) if isinstance(result, dict) else 'Not a dict'}")
         
         # Get the greeting message (same as API)
-        assistant_messages = [msg for msg in result["messages"] if msg["role"] == "assistant"]
-        response_text = assistant_messages[-1]["content"] if assistant_messages else "Welcome to WareOnGo!"
+        response_text = next(
+            (msg["content"] for msg in reversed(result["messages"]) if msg["role"] == "assistant"),
+            "Welcome to WareOnGo!",
+        )
         
         print(f"💬 Response text: {response_text[:100]}...")
         
         # Convert dict result back to GraphState (same as API fix)
-        result_state = GraphState()
-        for key, value in result.items():
-            if hasattr(result_state, key):
-                setattr(result_state, key, value)
-                print(f"   Set {key} = {value}")
-            else:
-                print(f"   ⚠️  Skipped {key} (not in GraphState)")
+        state_fields = GraphState.__dataclass_fields__
+        result_state = GraphState(**{key: value for key, value in result.items() if key in state_fields})
+        for key in result.keys() - state_fields.keys():
+            print(f"   ⚠️  Skipped {key} (not in GraphState)")
         
         print(f"📊 Result state workflow_stage: {result_state.workflow_stage}")
         print(f"📊 Result state next_action: {result_state.next_action}")
@@ -8,6 +8,8 @@ import asyncio
 import os
 from tools.location_tool import analyze_location_query
 
+MAX_CONCURRENT_QUERIES = 10
+
 async def test_area_detection():
     """Test various location query formats"""
     
@@ -47,28 +49,36 @@ async def test_area_detection():
     print("🧪 Testing Dynamic Area Detection System")
     print("=" * 50)
     
-    for i, query in enumerate(test_cases, 1):
+    # The queries are independent, so run them concurrently (capped to stay under rate limits)
+    # and print the results in the original order afterwards
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+    
+    async def analyze(query):
+        async with semaphore:
+            return await analyze_location_query.ainvoke({"location_query": query})
+    
+    results = await asyncio.gather(*(analyze(query) for query in test_cases), return_exceptions=True)
+    
+    for i, (query, result) in enumerate(zip(test_cases, results), 1):
         print(f"\n{i}. Testing: '{query}'")
         print("-" * 30)
         
-        try:
-            result = await analyze_location_query.ainvoke({"location_query": query})
-            
-            print(f"📍 Location Analysis Results:")
-            print(f"   Cities: {result.get('cities')}")
-            print(f"   State: {result.get('state')}")
-            print(f"   Areas: {result.get('areas')}")
-            print(f"   Search Area: {result.get('search_area')}")
-            print(f"   Search City: {result.get('search_city')}")
-            print(f"   Is Area Search: {result.get('is_area_search')}")
-            
-            # Validate the detection logic
-            if "," in query:
-                expected_area_search = True
-                print(f"✅ Expected area search: {expected_area_search}, Got: {result.get('is_area_search')}")
-            
-        except Exception as e:
-            print(f"❌ Error testing '{query}': {e}")
+        if isinstance(result, Exception):
+            print(f"❌ Error testing '{query}': {result}")
+            continue
+        
+        print(f"📍 Location Analysis Results:")
+        print(f"   Cities: {result.get('cities')}")
+        print(f"   State: {result.get('state')}")
+        print(f"   Areas: {result.get('areas')}")
+        print(f"   Search Area: {result.get('search_area')}")
+        print(f"   Search City: {result.get('search_city')}")
+        print(f"   Is Area Search: {result.get('is_area_search')}")
+        
+        # Validate the detection logic
+        if "," in query:
+            expected_area_search = True
+            print(f"✅ Expected area search: {expected_area_search}, Got: {result.get('is_area_search')}")
     
     print("\n" + "=" * 50)
     print("🎯 Dynamic Area Detection Test Complete")
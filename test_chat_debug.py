@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
 import asyncio
+import functools
 import os
 from dotenv import load_dotenv
 load_dotenv()
@@ -9,11 +10,21 @@ from graph import create_warehouse_graph
 from state import GraphState
 from api import context_to_state, state_to_context, ConversationContext
 
+# Client-side history window: conversation_history only grows at the end until it passes
+# HISTORY_KEEP + HISTORY_DROP messages, then the oldest HISTORY_DROP are dropped in one go
+HISTORY_KEEP = 6
+HISTORY_DROP = 4
+
+@functools.lru_cache(maxsize=1)
+def _graph():
+    """Compile the workflow once per process; repeated debug runs reuse it."""
+    return create_warehouse_graph()
+
 async def debug_chat_workflow():
     """Debug the exact same workflow as the chat endpoint"""
     
     # Create the graph
-    graph = create_warehouse_graph()
+    graph = _graph()
     
     # Simulate the context from frontend
     frontend_context = ConversationContext(
@@ -56,8 +67,10 @@ async def debug_chat_workflow():
             print(f"  Message {i}: {msg['role']} - {msg['content'][:80]}...")
         
         # Get the last assistant message (same as chat endpoint)
-        assistant_messages = [msg for msg in result["messages"] if msg["role"] == "assistant"]
-        response_text = assistant_messages[-1]["content"] if assistant_messages else "Hello! How can I help you find a warehouse?"
+        response_text = next(
+            (msg["content"] for msg in reversed(result["messages"]) if msg["role"] == "assistant"),
+            "Hello! How can I help you find a warehouse?",
+        )
         
         print(f"🤖 Assistant response: {response_text[:100]}...")
         
@@ -78,10 +91,61 @@ async def debug_chat_workflow():
         traceback.print_exc()
         return {"success": False, "error": str(e)}
 
+async def debug_history_window():
+    """Play several turns like the frontend and check the history sent is append-only between resets"""
+    
+    graph = _graph()
+    config = {"configurable": {"thread_id": "stateless"}}
+    turns = [
+        "Can you share warehouses in blr",
+        "Around 10000 sqft",
+        "Yes, industrial land",
+        "Budget is 25 per sqft",
+        "At least 2 docks",
+        "Show me the results",
+    ]
+    
+    context = ConversationContext()
+    previous_history = None
+    resets = 0
+    
+    try:
+        for turn, user_message in enumerate(turns, 1):
+            history = context.conversation_history
+            if len(history) > HISTORY_KEEP + HISTORY_DROP:
+                history = history[HISTORY_DROP:]
+                context.conversation_history = history
+                resets += 1
+                print(f"✂️  Turn {turn}: dropped the oldest {HISTORY_DROP} messages")
+            elif previous_history is not None:
+                # Between resets the previous request's history must be an unchanged prefix of this one
+                assert history[:len(previous_history)] == previous_history, \
+                    f"Turn {turn}: conversation_history changed before its last message"
+            previous_history = list(history)
+            print(f"📤 Turn {turn}: sending {len(history)} history messages")
+            
+            state = context_to_state(context)
+            state.add_message("user", user_message)
+            state.next_action = "update_state"
+            result = await graph.ainvoke(state, config=config)
+            context = state_to_context(result)
+        
+        print(f"✅ History stayed append-only between resets ({resets} reset(s) over {len(turns)} turns)")
+        return {"success": True, "resets": resets}
+        
+    except Exception as e:
+        print(f"❌ Error in history window check: {e}")
+        import traceback
+        traceback.print_exc()
+        return {"success": False, "error": str(e)}
+
 if __name__ == "__main__":
     result = asyncio.run(debug_chat_workflow())
     if result["success"]:
         print("🎉 Chat workflow completed!")
         print(f"🔍 Analysis: Response {'seems correct' if 'blr' in result['response'].lower() or 'bangalore' in result['response'].lower() else 'seems wrong - still showing greeting'}")
     else:
-        print("💥 Chat workflow failed!")
\ No newline at end of file
+        print("💥 Chat workflow failed!")
+    
+    window_result = asyncio.run(debug_history_window())
+    print("🎉 History window check passed!" if window_result["success"] else "💥 History window check failed!")
\ No newline at end of file
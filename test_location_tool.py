@@ -13,19 +13,24 @@ async def test_location_tool():
     """Test the location tool with different inputs"""
     test_inputs = ["bangalore", "blr", "Bangalore", "BLR"]
     
-    for location in test_inputs:
-        try:
-            print(f"\n--- Testing: '{location}' ---")
-            result = await analyze_location_query.ainvoke({"location_query": location})
-            print(f"Result: {result}")
-            print(f"Type: {type(result)}")
-            
-            if isinstance(result, dict):
-                print(f"Cities: {result.get('cities')}")
-                print(f"State: {result.get('state')}")
-            
-        except Exception as e:
-            print(f"Error with '{location}': {e}")
+    # The lookups are independent, so issue them together and print in input order
+    results = await asyncio.gather(
+        *(analyze_location_query.ainvoke({"location_query": location}) for location in test_inputs),
+        return_exceptions=True,
+    )
+    
+    for location, result in zip(test_inputs, results):
+        print(f"\n--- Testing: '{location}' ---")
+        if isinstance(result, Exception):
+            print(f"Error with '{location}': {result}")
+            continue
+        
+        print(f"Result: {result}")
+        print(f"Type: {type(result)}")
+        
+        if isinstance(result, dict):
+            print(f"Cities: {result.get('cities')}")
+            print(f"State: {result.get('state')}")
 
 if __name__ == "__main__":
     asyncio.run(test_location_tool())
\ No newline at end of file
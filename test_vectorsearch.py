@@ -3,11 +3,13 @@ import sys
 import psycopg2
 from dotenv import load_dotenv
 from openai import OpenAI
+from populate import EMBEDDING_MODEL, embedding_cache_key, get_cached_embeddings, open_embedding_cache, store_embeddings
 
 # --- CONFIGURATION ---
 load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+HNSW_EF_SEARCH = 40  # HNSW candidate list size per search (recall vs. speed); must be >= the LIMIT
 
 # Initialize API clients
 try:
@@ -25,77 +27,109 @@ def get_db_connection():
         print(f"Error connecting to the database: {e}")
         sys.exit(1)
 
-def get_embedding(text):
-    """Generates a vector embedding for a given text block."""
+def get_embeddings(texts):
+    """Generates vector embeddings for several text blocks, reusing the on-disk embedding cache.
+
+    Every text missing from the cache is embedded in a single request. Returns None on failure.
+    """
+    cache = open_embedding_cache()
     try:
-        response = openai_client.embeddings.create(
-            model="text-embedding-3-small",
-            input=text
-        )
-        return response.data[0].embedding
+        keys = [embedding_cache_key(text) for text in texts]
+        embeddings = get_cached_embeddings(cache, keys)
+        misses = [(key, text) for key, text in zip(keys, texts) if key not in embeddings]
+        if misses:
+            response = openai_client.embeddings.create(
+                model=EMBEDDING_MODEL,
+                input=[text for _, text in misses]
+            )
+            ordered = sorted(response.data, key=lambda item: item.index)
+            new_items = [(key, item.embedding) for (key, _), item in zip(misses, ordered)]
+            store_embeddings(cache, new_items)
+            embeddings.update(new_items)
+        return [embeddings[key] for key in keys]
     except Exception as e:
         print(f"Error getting embedding from OpenAI: {e}")
         return None
+    finally:
+        cache.close()
 
 # --- MAIN SCRIPT ---
 def main():
-    """Takes a CLI query, searches the DB, and displays top 5 matches."""
-    # 1. Get query from command-line arguments
+    """Takes one or more CLI queries (separated by ';'), searches the DB, and displays the top 5 matches for each."""
+    # 1. Get queries from command-line arguments
     if len(sys.argv) < 2:
-        print("Usage: python search.py \"<your search query>\"")
+        print("Usage: python search.py \"<your search query>[; <another query>...]\"")
         sys.exit(1)
     
-    query_text = " ".join(sys.argv[1:])
-    print(f"🔍 Searching for locations similar to: \"{query_text}\"")
+    queries = [query.strip() for query in " ".join(sys.argv[1:]).split(";") if query.strip()]
+    for query_text in queries:
+        print(f"🔍 Searching for locations similar to: \"{query_text}\"")
 
-    # 2. Generate embedding for the user's query
-    query_embedding = get_embedding(query_text)
-    if query_embedding is None:
+    # 2. Generate embeddings for all the queries in one request
+    query_embeddings = get_embeddings(queries)
+    if query_embeddings is None:
         sys.exit(1)
         
-    # 3. Connect to the DB and perform the similarity search
+    # 3. Connect to the DB and perform every similarity search in one round trip:
+    # each query vector gets its own top 5 through a LATERAL subquery
     conn = get_db_connection()
     cur = conn.cursor()
 
     sql_query = """
-        SELECT 
-            w.id,
-            w.address,
-            w.city,
-            w.state,
-            wd."fireNocAvailable",
-            wd."fireSafetyMeasures",
-            wd."landType",
-            wd.embedding <=> %s AS distance
-        FROM "WarehouseData" wd
-        JOIN "Warehouse" w ON w.id = wd."warehouseId"
-        ORDER BY distance
-        LIMIT 5;
+        SELECT
+            q.idx,
+            m.*
+        FROM unnest(%s::int[], %s::vector[]) AS q(idx, v)
+        CROSS JOIN LATERAL (
+            SELECT 
+                w.id,
+                w.address,
+                w.city,
+                w.state,
+                wd."fireNocAvailable",
+                wd."fireSafetyMeasures",
+                wd."landType",
+                wd.embedding <=> q.v AS distance
+            FROM "WarehouseData" wd
+            JOIN "Warehouse" w ON w.id = wd."warehouseId"
+            ORDER BY distance
+            LIMIT 5
+        ) m
+        ORDER BY q.idx, m.distance;
     """
     
     try:
-        # Pass the embedding as a string representation of the list
-        cur.execute(sql_query, (str(query_embedding),))
+        # Pin the HNSW search breadth for this transaction instead of relying on the server default
+        cur.execute(f"SET LOCAL hnsw.ef_search = {HNSW_EF_SEARCH};")
+        # Pass the embeddings as string representations of the lists
+        cur.execute(sql_query, (list(range(len(queries))), [str(embedding) for embedding in query_embeddings]))
         results = cur.fetchall()
         
-        if not results:
-            print("\nNo matches found.")
-            return
+        matches = {idx: [] for idx in range(len(queries))}
+        for idx, *row in results:
+            matches[idx].append(row)
+
+        for idx, query_text in enumerate(queries):
+            if len(queries) > 1:
+                print(f"\n=== \"{query_text}\" ===")
+            if not matches[idx]:
+                print("\nNo matches found.")
+                continue
 
-        print("\n--- Top 5 Matches ---")
-        for i, row in enumerate(results):
-            (warehouse_id, address, city, state, 
-             fire_noc, fire_safety, land_type, distance) = row
-            
-            # Convert distance to a more intuitive similarity score
-            similarity_score = 1 - distance
-            
-            print(f"\n{i+1}. Warehouse ID: {warehouse_id} (Similarity Score: {similarity_score:.4f})")
-            print(f"   Address: {address}, {city}, {state}")
-            print(f"   Land Type: {land_type or 'N/A'}")
-            print(f"   Fire NOC: {'Yes' if fire_noc else 'No' if fire_noc is not None else 'N/A'}")
-            print(f"   Fire Safety: {fire_safety or 'N/A'}")
-        print("\n-------------------")
+            print("\n--- Top 5 Matches ---")
+            for i, row in enumerate(matches[idx]):
+                (warehouse_id, address, city, state, 
+                 fire_noc, fire_safety, land_type, distance) = row
+                
+                # Convert distance to a more intuitive similarity score
+                similarity_score = 1 - distance
+                
+                print(f"\n{i+1}. Warehouse ID: {warehouse_id} (Similarity Score: {similarity_score:.4f})")
+                print(f"   Address: {address}, {city}, {state}")
+                print(f"   Land Type: {land_type or 'N/A'}")
+                print(f"   Fire NOC: {'Yes' if fire_noc else 'No' if fire_noc is not None else 'N/A'}")
+                print(f"   Fire Safety: {fire_safety or 'N/A'}")
+            print("\n-------------------")
 
     except Exception as e:
         print(f"An error occurred during the database query: {e}")
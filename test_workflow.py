@@ -34,51 +34,54 @@ async def test_area_search_workflow():
         }
     ]
     
-    for i, test_case in enumerate(test_cases, 1):
+    # Each case parses its own fresh state, so run the LLM-backed parsing for all of them
+    # concurrently and report the results in order afterwards
+    states = []
+    for test_case in test_cases:
+        state = GraphState()
+        state.add_message("user", test_case["query"])
+        states.append(state)
+    
+    results = await asyncio.gather(*(update_state_node(state) for state in states), return_exceptions=True)
+    
+    for i, (test_case, result_state) in enumerate(zip(test_cases, results), 1):
         print(f"\n{i}. Testing: '{test_case['query']}'")
         print("-" * 40)
         
-        # Create state and simulate user input
-        state = GraphState()
-        state.add_message("user", test_case["query"])
+        if isinstance(result_state, Exception):
+            print(f"❌ Error testing workflow: {result_state}")
+            import traceback
+            traceback.print_exception(result_state)
+            continue
         
-        try:
-            # Run the state update node which parses user input
-            result_state = await update_state_node(state)
-            
-            print(f"📍 Results:")
-            print(f"   Location Query: {result_state.location_query}")
-            print(f"   Parsed Cities: {result_state.parsed_cities}")
-            print(f"   Search Area: {result_state.search_area}")
-            print(f"   Search City: {result_state.search_city}")
-            print(f"   Is Area Search: {result_state.is_area_search}")
-            print(f"   Size Min: {result_state.size_min}")
-            print(f"   Size Max: {result_state.size_max}")
-            print(f"   Workflow Stage: {result_state.workflow_stage}")
-            
-            # Validate expectations
-            if "expected_area" in test_case:
-                expected = test_case["expected_area"]
-                actual = result_state.search_area
-                status = "✅" if expected in str(actual) else "❌"
-                print(f"   {status} Expected area '{expected}' in result: {actual}")
-            
-            if "expected_city" in test_case:
-                expected = test_case["expected_city"]
-                actual = result_state.search_city or result_state.parsed_cities
-                status = "✅" if expected in str(actual) else "❌"
-                print(f"   {status} Expected city '{expected}' in result: {actual}")
-                
-            if "expected_area_search" in test_case:
-                expected = test_case["expected_area_search"]
-                actual = result_state.is_area_search
-                status = "✅" if expected == actual else "❌"
-                print(f"   {status} Expected area search: {expected}, Got: {actual}")
+        print(f"📍 Results:")
+        print(f"   Location Query: {result_state.location_query}")
+        print(f"   Parsed Cities: {result_state.parsed_cities}")
+        print(f"   Search Area: {result_state.search_area}")
+        print(f"   Search City: {result_state.search_city}")
+        print(f"   Is Area Search: {result_state.is_area_search}")
+        print(f"   Size Min: {result_state.size_min}")
+        print(f"   Size Max: {result_state.size_max}")
+        print(f"   Workflow Stage: {result_state.workflow_stage}")
+        
+        # Validate expectations
+        if "expected_area" in test_case:
+            expected = test_case["expected_area"]
+            actual = result_state.search_area
+            status = "✅" if expected in str(actual) else "❌"
+            print(f"   {status} Expected area '{expected}' in result: {actual}")
+        
+        if "expected_city" in test_case:
+            expected = test_case["expected_city"]
+            actual = result_state.search_city or result_state.parsed_cities
+            status = "✅" if expected in str(actual) else "❌"
+            print(f"   {status} Expected city '{expected}' in result: {actual}")
             
-        except Exception as e:
-            print(f"❌ Error testing workflow: {e}")
-            import traceback
-            traceback.print_exc()
+        if "expected_area_search" in test_case:
+            expected = test_case["expected_area_search"]
+            actual = result_state.is_area_search
+            status = "✅" if expected == actual else "❌"
+            print(f"   {status} Expected area search: {expected}, Got: {actual}")
     
     print("\n" + "=" * 50)
     print("🎯 Complete Workflow Test Complete")
@@ -1,12 +1,56 @@
  # tools.py
 
+import asyncio
+import functools
+import logging
 import os
-import sqlalchemy
-from sqlalchemy.ext.asyncio import create_async_engine
-from typing import Optional, List
+import re
+import asyncpg
+from typing import Optional, List, TypedDict, Unpack
+from urllib.parse import urlparse
 from langchain.tools import tool
 from pydantic.v1 import BaseModel, Field
 
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 5
+
+_pool_task = None
+
+async def _get_pool():
+    """One asyncpg connection pool per event loop, created on first use and reused by every search."""
+    global _pool_task
+    # A pool's connections belong to the loop that opened them, so a new loop (another asyncio.run)
+    # gets a new pool; the old one is left behind with its loop
+    if (_pool_task is None or _pool_task.get_loop() is not asyncio.get_running_loop()
+            or (_pool_task.done() and (_pool_task.cancelled() or _pool_task.exception() is not None))):
+        # Parse the connection URL manually
+        parsed = urlparse(os.environ["DATABASE_URL"])
+        _pool_task = asyncio.ensure_future(asyncpg.create_pool(
+            user=parsed.username,
+            password=parsed.password,
+            database=parsed.path[1:],  # Remove leading slash
+            host=parsed.hostname,
+            port=parsed.port,
+            min_size=2,
+            max_size=10,
+            statement_cache_size=256,
+        ))
+    return await _pool_task
+
+async def close_pool():
+    """Close the shared pool's connections. Call once on shutdown."""
+    global _pool_task
+    if _pool_task is not None:
+        task, _pool_task = _pool_task, None
+        if task.get_loop() is not asyncio.get_running_loop():
+            return
+        try:
+            pool = await task
+        except Exception:
+            return
+        await pool.close()
+
 class WarehouseSearchInput(BaseModel):
     cities: Optional[List[str]] = Field(description="A list of cities to search for warehouses in, e.g., ['Bangalore', 'Mysore']")
     state: Optional[str] = Field(description="A single state to search for warehouses in, e.g., 'Karnataka'.")
@@ -27,280 +71,249 @@ class WarehouseSearchInput(BaseModel):
     fire_noc_required: Optional[bool] = Field(description="Set to True to search for warehouses with fire NOC available.")
     land_type_industrial: Optional[bool] = Field(description="Set to True to search for warehouses on industrial land type.")
     page: int = Field(default=1, description="The page number of results to retrieve. Defaults to 1.")
+    after_id: Optional[int] = Field(default=None, description="Keyset cursor: only return warehouses with an id below this one (the last id of the previous page).")
 
 
-async def _execute_query(engine, params: dict, page_num: int = 1):
-    """A helper function to build and execute the full SQL query asynchronously."""
+class WarehouseSearchKwargs(TypedDict, total=False):
+    """The WarehouseSearchInput fields as a plain TypedDict, for in-process callers of search_warehouses.
+
+    Code that already builds well-typed params (search_database_node) calls search_warehouses directly
+    and skips the pydantic validation the LLM-facing tool runs on every call.
+    """
+    cities: List[str]
+    state: str
+    search_area: str
+    search_address: str
+    is_area_search: bool
+    min_sqft: int
+    max_sqft: int
+    warehouse_type: str
+    min_rate_per_sqft: int
+    max_rate_per_sqft: int
+    min_docks: int
+    min_clear_height: int
+    compliances: str
+    availability: str
+    zone: str
+    is_broker: bool
+    fire_noc_required: bool
+    land_type_industrial: bool
+    page: int
+    after_id: int
+
+
+def _as_number(column: str) -> str:
+    """SQL for a numeric-looking text column of Warehouse as a number, NULL for anything else.
+
+    indexes.sql has an expression index on exactly this for each column filtered on, so keep the two in sync.
+    The CASE (rather than a regex test AND a cast) also guarantees the cast never sees a non-number.
+    """
+    return f"""(CASE WHEN w."{column}" ~ '^[0-9]+(\\.[0-9]+)?$' THEN w."{column}"::numeric END)"""
+
+
+def _query_shape(params: dict) -> frozenset:
+    """The filters that change the SQL text. Their values only change the bind parameters."""
+    shape = {k for k, v in params.items() if v is not None and k != "page"}
+    # These two only add a clause when set to True
+    for flag in ("fire_noc_required", "land_type_industrial"):
+        if params.get(flag) is not True:
+            shape.discard(flag)
+    return frozenset(shape)
+
+
+def _contains(value: str) -> str:
+    """ILIKE pattern matching value anywhere in the column."""
+    return f"%{value}%"
+
+
+# The filters that apply independently of each other, in the order their clauses are added:
+# (search param, SQL clause, how to turn the value into its bind parameter or None to pass it as-is)
+SEARCH_FILTERS = (
+    # Handle min and max square footage against an array column
+    ("min_sqft", ' AND EXISTS (SELECT 1 FROM unnest(w."totalSpaceSqft") AS s WHERE s >= :min_sqft)', None),
+    ("max_sqft", ' AND EXISTS (SELECT 1 FROM unnest(w."totalSpaceSqft") AS s WHERE s <= :max_sqft)', None),
+    ("warehouse_type", ' AND w."warehouseType" ILIKE :warehouse_type', _contains),
+    ("min_rate_per_sqft", f" AND {_as_number('ratePerSqft')} >= :min_rate_per_sqft", None),
+    ("max_rate_per_sqft", f" AND {_as_number('ratePerSqft')} <= :max_rate_per_sqft", None),
+    ("min_docks", f" AND {_as_number('numberOfDocks')} >= :min_docks", None),
+    ("min_clear_height", f" AND {_as_number('clearHeightFt')} >= :min_clear_height", None),
+    ("compliances", ' AND w.compliances ILIKE :compliances', _contains),
+    ("availability", ' AND w.availability ILIKE :availability', _contains),
+    ("zone", ' AND w.zone ILIKE :zone', _contains),
+    ("is_broker", ' AND w."isBroker" ILIKE :is_broker', lambda is_broker: 'Yes' if is_broker else 'No'),
+    ("fire_noc_required", ' AND wd."fireNocAvailable" = :fire_noc_required', None),
+    ("land_type_industrial", ' AND wd."landType" ILIKE :land_type_industrial', lambda _: '%industrial%'),
+    # Keyset pagination: seek straight past the previous page instead of scanning an OFFSET
+    ("after_id", ' AND w.id < :after_id', None),
+)
+
+
+# A :name bind parameter (but not the second colon of a ::type cast)
+BIND_PARAM_RE = re.compile(r"(?<![:\w]):(\w+)")
+
+
+def _positional(sql: str) -> tuple:
+    """Rewrite :name parameters to asyncpg's $n. Returns (sql, keys) with the names in placeholder order."""
+    keys = []
+
+    def placeholder(match):
+        if match.group(1) not in keys:
+            keys.append(match.group(1))
+        return f"${keys.index(match.group(1)) + 1}"
+
+    return BIND_PARAM_RE.sub(placeholder, sql), tuple(keys)
+
+
+@functools.lru_cache(maxsize=512)
+def _build_sql(shape: frozenset) -> tuple:
+    """Build the search query for a set of filters. Cached, since there are only a few shapes in practice.
+
+    Returns (sql, keys) where keys lists the bind parameter names in $n order.
+    """
     # Updated query to join with WarehouseData table for fire NOC and land type info
     # Include address field for area-based searches
-    query = '''SELECT w.id, w."warehouseType", w.city, w.state, w."totalSpaceSqft", w."ratePerSqft", 
+    clauses = ['''SELECT w.id, w."warehouseType", w.city, w.state, w."totalSpaceSqft", w."ratePerSqft", 
                       w."numberOfDocks", w."clearHeightFt", w.compliances, w.address,
                       wd."fireNocAvailable", wd."fireSafetyMeasures", wd."landType"
                FROM "Warehouse" w
                LEFT JOIN "WarehouseData" wd ON w.id = wd."warehouseId"
-               WHERE 1=1'''
-    
-    query_params = params.copy()
+               WHERE 1=1''']
 
     # Enhanced location filtering with area support
-    if "search_area" in query_params and "cities" in query_params:
+    if "search_area" in shape and "cities" in shape:
         # Area-specific search within cities
-        query += " AND (w.city ILIKE ANY(:cities) AND w.address ILIKE :search_area)"
-        query_params['cities'] = [f"%{city}%" for city in query_params['cities']]
-        query_params['search_area'] = f"%{query_params['search_area']}%"
-    elif "search_area" in query_params:
+        clauses.append(" AND (w.city ILIKE ANY(:cities) AND w.address ILIKE :search_area)")
+    elif "search_area" in shape:
         # Area-only search
-        query += " AND w.address ILIKE :search_area"
-        query_params['search_area'] = f"%{query_params['search_area']}%"
-    elif "cities" in query_params:
+        clauses.append(" AND w.address ILIKE :search_area")
+    elif "cities" in shape:
         # Make city search case-insensitive by using ILIKE with ANY
-        query += " AND w.city ILIKE ANY(:cities)"
+        clauses.append(" AND w.city ILIKE ANY(:cities)")
+    elif "state" in shape:
+        # Case-insensitive equality (what ILIKE without wildcards did), in a form the lower(state) index serves
+        clauses.append(" AND lower(w.state) = lower(:state)")
+
+    clauses += [clause for key, clause, _ in SEARCH_FILTERS if key in shape]
+    # Page size and offset are bound too, so every page of a search shares one statement
+    clauses.append(' ORDER BY w.id DESC LIMIT :limit OFFSET :offset;')
+    return _positional("".join(clauses))
+
+
+def _bind_params(params: dict, page_num: int = 1) -> dict:
+    """Turn the search values into bind parameters (LIKE patterns and the like) for _build_sql."""
+    query_params = params.copy()
+    query_params['limit'] = PAGE_SIZE
+    # With a keyset cursor the seek replaces the offset
+    query_params['offset'] = 0 if "after_id" in params else (page_num - 1) * PAGE_SIZE
+    if "cities" in query_params:
         # Convert all cities to patterns for case-insensitive matching
-        query_params['cities'] = [f"%{city}%" for city in query_params['cities']]
-    elif "state" in query_params:
-        query += " AND w.state ILIKE :state"
-        query_params['state'] = query_params['state']  # Exact match for state names
+        query_params['cities'] = [_contains(city) for city in query_params['cities']]
+    if "search_area" in query_params:
+        query_params['search_area'] = _contains(query_params['search_area'])
+    for key, _, to_bind in SEARCH_FILTERS:
+        if to_bind is not None and key in query_params:
+            query_params[key] = to_bind(query_params[key])
+    return query_params
 
-    # Handle min and max square footage against an array column
-    if "min_sqft" in query_params:
-        query += ' AND EXISTS (SELECT 1 FROM unnest(w."totalSpaceSqft") AS s WHERE s >= :min_sqft)'
-    if "max_sqft" in query_params:
-        query += ' AND EXISTS (SELECT 1 FROM unnest(w."totalSpaceSqft") AS s WHERE s <= :max_sqft)'
-
-    if "warehouse_type" in query_params:
-        query += ' AND w."warehouseType" ILIKE :warehouse_type'
-        query_params['warehouse_type'] = f"%{query_params['warehouse_type']}%"
-    if "min_rate_per_sqft" in query_params:
-        # Corrected regex for rate per sqft
-        query += " AND w.\"ratePerSqft\" ~ '^[0-9.]+$' AND CAST(w.\"ratePerSqft\" AS INTEGER) >= :min_rate_per_sqft"
-    if "max_rate_per_sqft" in query_params:
-        # Corrected regex for rate per sqft
-        query += " AND w.\"ratePerSqft\" ~ '^[0-9.]+$' AND CAST(w.\"ratePerSqft\" AS INTEGER) <= :max_rate_per_sqft"
-    if "min_docks" in query_params:
-        query += " AND w.\"numberOfDocks\" ~ '^[0-9.]+$' AND CAST(w.\"numberOfDocks\" AS INTEGER) >= :min_docks"
-    if "min_clear_height" in query_params:
-        query += " AND w.\"clearHeightFt\" ~ '^[0-9.]+$' AND CAST(w.\"clearHeightFt\" AS INTEGER) >= :min_clear_height"
-    if "compliances" in query_params:
-        query += ' AND w.compliances ILIKE :compliances'
-        query_params['compliances'] = f"%{query_params['compliances']}%"
-    if "availability" in query_params:
-        query += ' AND w.availability ILIKE :availability'
-        query_params['availability'] = f"%{query_params['availability']}%"
-    if "zone" in query_params:
-        query += ' AND w.zone ILIKE :zone'
-        query_params['zone'] = f"%{query_params['zone']}%"
-    if "is_broker" in query_params and query_params.get("is_broker") is not None:
-        query += ' AND w."isBroker" ILIKE :is_broker'
-        query_params['is_broker'] = 'Yes' if query_params['is_broker'] else 'No'
-    
-    # NEW: Handle fire NOC requirement
-    if "fire_noc_required" in query_params and query_params.get("fire_noc_required") is True:
-        query += ' AND wd."fireNocAvailable" = :fire_noc_required'
-    
-    # NEW: Handle industrial land type requirement
-    if "land_type_industrial" in query_params and query_params.get("land_type_industrial") is True:
-        query += ' AND wd."landType" ILIKE :land_type'
-        query_params['land_type'] = '%industrial%'
 
-    limit = 5
-    offset = (page_num - 1) * limit
-    query += f' ORDER BY w.id DESC LIMIT {limit} OFFSET {offset};'
+async def _execute_query(params: dict, page_num: int = 1):
+    """A helper function to build and execute the full SQL query asynchronously."""
+    query, keys = _build_sql(_query_shape(params))
+    query_params = _bind_params(params, page_num)
 
-    async with engine.connect() as connection:
-        result = await connection.execute(sqlalchemy.text(query), query_params)
-        return result.fetchall()
+    pool = await _get_pool()
+    async with pool.acquire() as conn:
+        return await conn.fetch(query, *[query_params[k] for k in keys])
 
 
-@tool("warehouse-database-search", args_schema=WarehouseSearchInput)
-async def find_warehouses_in_db(**kwargs) -> str:
+def _format_row(row) -> str:
+    """One result line for a warehouse row (an asyncpg Record)."""
+    space_values = row['totalSpaceSqft']
+    space_str = ", ".join(map(str, space_values)) if space_values is not None else "Not specified"
+    
+    # Build basic warehouse info
+    parts = [f"ID: {row['id']}, Type: {row['warehouseType']}, City: {row['city']}, State: {row['state']}, Spaces: {space_str} sqft, Rate: {row['ratePerSqft']}, Docks: {row['numberOfDocks']}"]
+    
+    # Add fire NOC information if available
+    fire_noc = row['fireNocAvailable']
+    if fire_noc is not None:
+        parts.append("✅ Fire NOC Available" if fire_noc else "❌ Fire NOC Not Available")
+        
+        # Add fire safety measures if available
+        fire_measures = row['fireSafetyMeasures']
+        if fire_measures:
+            parts.append(f"Fire Safety: {fire_measures}")
+    
+    # Add land type information if available
+    land_type = row['landType']
+    if land_type:
+        parts.append(f"Land Type: {land_type}")
+    
+    return ", ".join(parts)
+
+
+async def search_warehouses(**kwargs: Unpack[WarehouseSearchKwargs]) -> dict:
     """
     Searches for warehouses asynchronously. If no results are found, it automatically relaxes price constraints.
     If too few results are found, it expands the search to include more options.
     
-    Uses a fallback approach: try SQLAlchemy async first, then fall back to direct asyncpg if needed.
+    Returns {"text": <rendered results or status message>, "ids": <ids of the warehouses listed>}.
     """
-    import asyncpg
-    from urllib.parse import urlparse
-    
-    db_uri = os.environ["DATABASE_URL"]
-    
-    # First try the original SQLAlchemy approach
-    try:
-        if not db_uri.startswith("postgresql+asyncpg"):
-            sqlalchemy_uri = db_uri.replace("postgresql://", "postgresql+asyncpg://")
-        else:
-            sqlalchemy_uri = db_uri
+    params = {k: v for k, v in kwargs.items() if v is not None}
+    page = params.get("page", 1)
+    user_message = ""
 
-        engine = create_async_engine(sqlalchemy_uri, pool_pre_ping=True)
-        
-        params = {k: v for k, v in kwargs.items() if v is not None}
-        page = params.get("page", 1)
-        user_message = ""
+    try:
+        if page == 1 and "max_rate_per_sqft" in params:
+            # Run the +15% budget query alongside the exact one instead of after it, so an empty or
+            # short first page doesn't cost a second round trip. It skips rates already within budget,
+            # which also makes it the right fallback: if nothing matched exactly, there were none to skip.
+            original_rate = params["max_rate_per_sqft"]
+            min_rate = params.get("min_rate_per_sqft")
+            relaxed_params = dict(
+                params,
+                max_rate_per_sqft=int(original_rate * 1.15),
+                min_rate_per_sqft=min_rate if min_rate is not None and min_rate > original_rate else original_rate + 1,
+            )
 
-        rows = await _execute_query(engine, params, page)
-        
-        # Handle the rest of the logic...
-        if page == 1:
-            if not rows and "max_rate_per_sqft" in params:
-                original_rate = params["max_rate_per_sqft"]
-                fallback_params = params.copy()
-                fallback_params["max_rate_per_sqft"] = int(original_rate * 1.15)
-                
-                rows = await _execute_query(engine, fallback_params, page)
-                if rows:
-                    user_message = f"I couldn't find anything at your exact price of ₹{original_rate}/sqft, but found these with a rate up to ₹{fallback_params['max_rate_per_sqft']}/sqft:\n\n"
-
-            elif 0 < len(rows) < 5 and "max_rate_per_sqft" in params:
-                original_rate = params["max_rate_per_sqft"]
-                
-                expansion_params = params.copy()
-                expansion_params["max_rate_per_sqft"] = int(original_rate * 1.15)
-                if "min_rate_per_sqft" not in expansion_params or expansion_params["min_rate_per_sqft"] <= original_rate:
-                     expansion_params["min_rate_per_sqft"] = original_rate + 1
-                
-                expansion_rows = await _execute_query(engine, expansion_params, 1)
-                
-                if expansion_rows:
-                    user_message = "To give you more options, I've also included some warehouses with slightly higher rates:\n\n"
-                    existing_ids = {row.id for row in rows}
-                    for row in expansion_rows:
-                        if row.id not in existing_ids and len(rows) < 5:
-                            rows.append(row)
-
-        if not rows:
-            if page > 1:
-                return "NO_RESULTS_FOUND: That's all the warehouses I could find with your current criteria. Try adjusting your location, budget, or size requirements for more options."
-            else:
-                return "NO_RESULTS_FOUND: No warehouses found with these exact requirements. Consider expanding your search area, adjusting budget range, or relaxing size specifications to see more options."
-
-        formatted_results = []
-        for row in rows:
-            row_dict = dict(row._mapping)
-            space_values = row_dict.get('totalSpaceSqft')
-            space_str = ", ".join(map(str, space_values)) if space_values is not None else "Not specified"
-            
-            # Build basic warehouse info
-            result_line = f"ID: {row_dict['id']}, Type: {row_dict['warehouseType']}, City: {row_dict['city']}, State: {row_dict['state']}, Spaces: {space_str} sqft, Rate: {row_dict['ratePerSqft']}, Docks: {row_dict['numberOfDocks']}"
-            
-            # Add fire NOC information if available
-            fire_noc = row_dict.get('fireNocAvailable')
-            if fire_noc is not None:
-                fire_status = "✅ Fire NOC Available" if fire_noc else "❌ Fire NOC Not Available"
-                result_line += f", {fire_status}"
-                
-                # Add fire safety measures if available
-                fire_measures = row_dict.get('fireSafetyMeasures')
-                if fire_measures:
-                    result_line += f", Fire Safety: {fire_measures}"
-            
-            # Add land type information if available
-            land_type = row_dict.get('landType')
-            if land_type:
-                result_line += f", Land Type: {land_type}"
-            
-            formatted_results.append(result_line)
-            
-        return user_message + "\n".join(formatted_results)
-        
-    except Exception as e:
-        # Fallback to direct asyncpg connection (debug message only, not shown to user)
-        debug_mode = os.getenv("DEBUG", "false").lower() == "true"
-        if debug_mode:
-            print(f"SQLAlchemy failed ({e}), falling back to direct asyncpg...")
-        
-        try:
-            # Parse the connection URL manually
-            parsed = urlparse(db_uri)
-            
-            # Direct asyncpg connection
-            conn = await asyncpg.connect(
-                user=parsed.username,
-                password=parsed.password,
-                database=parsed.path[1:],  # Remove leading slash
-                host=parsed.hostname,
-                port=parsed.port
+            rows, relaxed_rows = await asyncio.gather(
+                _execute_query(params, page),
+                _execute_query(relaxed_params, 1),
             )
-            
-            params = {k: v for k, v in kwargs.items() if v is not None}
-            page = params.get("page", 1)
-            
-            # Build query manually with WarehouseData join
-            query = '''SELECT w.id, w."warehouseType", w.city, w.state, w."totalSpaceSqft", w."ratePerSqft", 
-                              w."numberOfDocks", w."clearHeightFt", w.compliances,
-                              wd."fireNocAvailable", wd."fireSafetyMeasures", wd."landType"
-                       FROM "Warehouse" w
-                       LEFT JOIN "WarehouseData" wd ON w.id = wd."warehouseId"
-                       WHERE 1=1'''
-            query_params = []
-            param_values = []
-            
-            if "cities" in params:
-                # Use case-insensitive search for cities in asyncpg fallback
-                city_conditions = []
-                for city in params["cities"]:
-                    city_conditions.append(f"w.city ILIKE $" + str(len(param_values) + 1))
-                    param_values.append(f"%{city}%")
-                query += " AND (" + " OR ".join(city_conditions) + ")"
-            elif "state" in params:
-                # Add missing state filtering for asyncpg fallback
-                query += " AND w.state ILIKE $" + str(len(param_values) + 1)
-                param_values.append(params['state'])  # Exact match for state names
-            
-            if "min_sqft" in params:
-                query += ' AND EXISTS (SELECT 1 FROM unnest(w."totalSpaceSqft") AS s WHERE s >= $' + str(len(param_values) + 1) + ')'
-                param_values.append(params["min_sqft"])
-                
-            if "max_sqft" in params:
-                query += ' AND EXISTS (SELECT 1 FROM unnest(w."totalSpaceSqft") AS s WHERE s <= $' + str(len(param_values) + 1) + ')'
-                param_values.append(params["max_sqft"])
-            
-            # Handle fire NOC requirement
-            if "fire_noc_required" in params and params.get("fire_noc_required") is True:
-                query += ' AND wd."fireNocAvailable" = $' + str(len(param_values) + 1)
-                param_values.append(True)
-            
-            # Handle industrial land type requirement
-            if "land_type_industrial" in params and params.get("land_type_industrial") is True:
-                query += ' AND wd."landType" ILIKE $' + str(len(param_values) + 1)
-                param_values.append('%industrial%')
-
-            limit = 5
-            offset = (page - 1) * limit
-            query += f' ORDER BY w.id DESC LIMIT {limit} OFFSET {offset};'
-            
-            rows = await conn.fetch(query, *param_values)
-            await conn.close()
-            
+
             if not rows:
-                return "NO_RESULTS_FOUND: No warehouses found with these specifications. Try expanding your location radius, increasing budget range, or adjusting size requirements to see more available options."
-            
-            formatted_results = []
-            for row in rows:
-                space_values = row['totalSpaceSqft']
-                space_str = ", ".join(map(str, space_values)) if space_values is not None else "Not specified"
-                
-                # Build basic warehouse info
-                result_line = f"ID: {row['id']}, Type: {row['warehouseType']}, City: {row['city']}, State: {row['state']}, Spaces: {space_str} sqft, Rate: {row['ratePerSqft']}, Docks: {row['numberOfDocks']}"
-                
-                # Add fire NOC information if available
-                fire_noc = row.get('fireNocAvailable')
-                if fire_noc is not None:
-                    fire_status = "✅ Fire NOC Available" if fire_noc else "❌ Fire NOC Not Available"
-                    result_line += f", {fire_status}"
-                    
-                    # Add fire safety measures if available
-                    fire_measures = row.get('fireSafetyMeasures')
-                    if fire_measures:
-                        result_line += f", Fire Safety: {fire_measures}"
-                
-                # Add land type information if available
-                land_type = row.get('landType')
-                if land_type:
-                    result_line += f", Land Type: {land_type}"
-                
-                formatted_results.append(result_line)
-                
-            return "\n".join(formatted_results)
-            
-        except Exception as fallback_error:
-            return f"Database connection failed: {fallback_error}"
\ No newline at end of file
+                rows = relaxed_rows
+                if rows:
+                    user_message = f"I couldn't find anything at your exact price of ₹{original_rate}/sqft, but found these with a rate up to ₹{relaxed_params['max_rate_per_sqft']}/sqft:\n\n"
+
+            elif len(rows) < PAGE_SIZE and relaxed_rows:
+                user_message = "To give you more options, I've also included some warehouses with slightly higher rates:\n\n"
+                # No overlap to filter out: every relaxed row is priced above the exact query's maximum
+                rows = [*rows, *relaxed_rows[:PAGE_SIZE - len(rows)]]
+        else:
+            rows = await _execute_query(params, page)
+    except (OSError, asyncpg.PostgresConnectionError) as e:
+        logger.warning("Warehouse search could not reach the database: %s", e)
+        return {"text": f"Database connection failed: {e}", "ids": []}
+    except (asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+        # The server answered but rejected the query (or its arguments): a bug, not an outage
+        logger.exception("Warehouse search query failed")
+        return {"text": f"Database query failed: {e}", "ids": []}
+
+    if not rows:
+        if page > 1:
+            return {"text": "NO_RESULTS_FOUND: That's all the warehouses I could find with your current criteria. Try adjusting your location, budget, or size requirements for more options.", "ids": []}
+        else:
+            return {"text": "NO_RESULTS_FOUND: No warehouses found with these exact requirements. Consider expanding your search area, adjusting budget range, or relaxing size specifications to see more options.", "ids": []}
+
+    formatted_results = [_format_row(row) for row in rows]
+    return {"text": user_message + "\n".join(formatted_results), "ids": [row['id'] for row in rows]}
+
+
+@tool("warehouse-database-search", args_schema=WarehouseSearchInput)
+async def find_warehouses_in_db(**kwargs) -> str:
+    """
+    Searches for warehouses asynchronously. If no results are found, it automatically relaxes price constraints.
+    If too few results are found, it expands the search to include more options.
+    """
+    return (await search_warehouses(**kwargs))["text"]
\ No newline at end of file
@@ -0,0 +1,46 @@
+# llm_client.py
+import asyncio
+import functools
+import weakref
+
+# Fail fast on a stuck request and let the fallback / error handling take over, rather than
+# waiting out the client's default 10-minute timeout and its retries
+LLM_TIMEOUT = 15  # seconds
+LLM_MAX_RETRIES = 2
+
+# One pooled HTTP/2 client shared by every LLM handle, so concurrent calls multiplex over a few
+# long-lived connections instead of paying a TCP + TLS handshake on each new connection.
+# httpx connections can only be used from the event loop that opened them, while the handles
+# holding this client live for the whole process (scripts may asyncio.run more than once), so the
+# client hands each request to a pool owned by the running loop.
+@functools.cache
+def get_http_client():
+    import httpx
+
+    class _PerLoopClient(httpx.AsyncClient):
+        def __init__(self):
+            super().__init__()
+            self._loop_clients = weakref.WeakKeyDictionary()  # event loop -> its pooled client
+
+        async def send(self, request, **kwargs):
+            loop = asyncio.get_running_loop()
+            client = self._loop_clients.get(loop)
+            if client is None:
+                client = self._loop_clients[loop] = httpx.AsyncClient(
+                    http2=True,
+                    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+                    timeout=30,
+                )
+            return await client.send(request, **kwargs)
+
+        async def aclose(self):
+            client = self._loop_clients.pop(asyncio.get_running_loop(), None)
+            if client is not None:
+                await client.aclose()
+
+    return _PerLoopClient()
+
+async def close_http_client():
+    """Close the running event loop's LLM connections. Call once on shutdown."""
+    if get_http_client.cache_info().currsize:
+        await get_http_client().aclose()
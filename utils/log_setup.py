@@ -0,0 +1,28 @@
+# log_setup.py
+import logging
+import os
+import sys
+from colorama import Fore, Style
+
+LEVEL_COLORS = {
+    logging.DEBUG: Fore.BLUE,
+    logging.INFO: Fore.YELLOW,
+    logging.WARNING: Fore.MAGENTA,
+    logging.ERROR: Fore.RED,
+    logging.CRITICAL: Fore.RED,
+}
+
+class ColorFormatter(logging.Formatter):
+    """Prefix each record with a coloured [LEVEL] tag, matching the agent's console output."""
+    def format(self, record):
+        color = LEVEL_COLORS.get(record.levelno, "")
+        return f"{color}[{record.levelname}]{Style.RESET_ALL} {super().format(record)}"
+
+def configure_logging():
+    """Send the agent's own log records to stdout. Set LOG_LEVEL=DEBUG to see node internals."""
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(ColorFormatter("%(message)s"))
+    logging.basicConfig(level=logging.WARNING, handlers=[handler])
+    level = os.getenv("LOG_LEVEL", "INFO").upper()
+    for name in ("nodes", "graph", "utils", "tools"):
+        logging.getLogger(name).setLevel(level)
@@ -1,7 +1,12 @@
-from colorama import Fore, Style
+import logging
+
+logger = logging.getLogger(__name__)
+
+# next_action values whose node has a different name; every other action is its own node
+ROUTES = {"wait_for_user": "human_input"}
 
 def router(state):
     if state.conversation_complete:
         return "__end__"
-    print(f"{Fore.MAGENTA}[ROUTER]{Style.RESET_ALL} Next: {state.next_action}")
-    return state.next_action.replace("wait_for_user","human_input")
+    logger.debug("Next: %s", state.next_action)
+    return ROUTES.get(state.next_action, state.next_action)